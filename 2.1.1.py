@@ -1,9 +1,8 @@
 import sys
 import csv
 import os
-import openpyxl
 from datetime import datetime
-from openpyxl.styles import Font, NamedStyle, Side, Border
+from ExcelReport import GenerateStatisticsExcel
 
 
 class Vacancy:
@@ -78,72 +77,8 @@ class Report:
             return ""
         return str(value)
 
-    @staticmethod
-    def __CompleteSheet(sheet, data, indexesData, count=None):
-        i, j = indexesData
-        if count is None:
-            count = len(data[i].keys()) + 1
-        for year in list(data[i].keys())[:count]:
-            row = [year]
-            for dictData in data[i:j]:
-                row.append(dictData[year])
-            sheet.append(row)
-        return sheet
-
-    @staticmethod
-    def __CopySheetToSheet( sheet1, sheet2):
-        maxColumn = sheet2.max_column
-        for i in range(1, sheet1.max_row + 1):
-            for j in range(1, sheet1.max_column + 1):
-                sheet2.cell(row=i + 1, column=maxColumn + j - 2).value = sheet1.cell(row=i, column=j).value
-        return sheet2
-
-    def __StyleSheet(self, sheet, headings, headingsStyle, cellStyle):
-
-        for row in sheet.rows:
-            for cell in row:
-                cell.style = cellStyle
-        for cell in sheet["1:1"]:
-            cell.style = headingsStyle
-        for column in sheet.columns:
-            length = max(len(self.CheckEmptyText(cell.value)) for cell in column)
-            sheet.column_dimensions[column[0].column_letter].width = length + 2
-
     def GenerateExcel(self, listData):
-        book = openpyxl.Workbook()
-        book.remove(book.active)
-        sheet1 = book.create_sheet("Статистика по годам")
-        sheet2 = book.create_sheet("Статистика по городам")
-        headingsByYear = ["Год", "Средняя зарплата", f'Средняя зарплата - {self.vacancyName}', "Количество вакансий",
-                          f'Количество вакансий - {self.vacancyName}']
-        headingsByCity = ["Город", "Уровень зарплат", "", "Город", "Доля вакансий"]
-        sheet1.append(headingsByYear)
-        sheet2.append(headingsByCity)
-
-        headingsStyle = NamedStyle(name='headingsStyle')
-        headingsStyle.font = Font(bold=True)
-        headingsStyle.border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'),
-                                      bottom=Side(style='thin'))
-        cellStyle = NamedStyle(name='cellStyle')
-        cellStyle.border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'),
-                                  bottom=Side(style='thin'))
-
-        tempSheet = book.create_sheet("tempSheet")
-        sheet1 = self.__CompleteSheet(sheet1, listData, (0, 4))
-        sheet2 = self.__CompleteSheet(sheet2, listData, (4, 5), 10)
-        tempSheet = self.__CompleteSheet(tempSheet, listData, (5, 6), 10)
-        sheet2 = self.__CopySheetToSheet(tempSheet, sheet2)
-        book.remove(tempSheet)
-
-        self.__StyleSheet(sheet1, headingsByYear, headingsStyle, cellStyle)
-        self.__StyleSheet(sheet2, headingsByCity, headingsStyle, cellStyle)
-
-        for cell in sheet2["C"]:
-            cell.border = Border(top=Side(style=None),
-                                 bottom=Side(style=None))
-        for cell in sheet2["E"]:
-            cell.number_format = '0.00%'
-        book.save("report.xlsx")
+        GenerateStatisticsExcel("report.xlsx", listData, self.vacancyName)
 
 
 class DataSet:
@@ -1,11 +1,9 @@
 import sys
 import csv
 import os
-import openpyxl
-import numpy as np
-import matplotlib.pyplot as plt
 from datetime import datetime
-from openpyxl.styles import Font, NamedStyle, Side, Border
+from ReportChart import ChartRenderer
+from ExcelReport import GenerateStatisticsExcel
 
 
 class Vacancy:
@@ -85,124 +83,12 @@ class Report:
             return ""
         return str(value)
 
-    @staticmethod
-    def _CompleteSheet(sheet, data, indexesData, count=None):
-        i, j = indexesData
-        if count is None:
-            count = len(data[i].keys()) + 1
-        for year in list(data[i].keys())[:count]:
-            row = [year]
-            for dictData in data[i:j]:
-                row.append(dictData[year])
-            sheet.append(row)
-        return sheet
-
-    @staticmethod
-    def __CopySheetToSheet(sheet1, sheet2):
-        maxColumn = sheet2.max_column
-        for i in range(1, sheet1.max_row + 1):
-            for j in range(1, sheet1.max_column + 1):
-                sheet2.cell(row=i + 1, column=maxColumn + j - 2).value = sheet1.cell(row=i, column=j).value
-        return sheet2
-
-    def __StyleSheet(self, sheet, headingsStyle, cellStyle):
-
-        for row in sheet.rows:
-            for cell in row:
-                cell.style = cellStyle
-        for cell in sheet["1:1"]:
-            cell.style = headingsStyle
-        for column in sheet.columns:
-            length = max(len(self.CheckEmptyText(cell.value)) for cell in column)
-            sheet.column_dimensions[column[0].column_letter].width = length + 2
-
     def GenerateExcel(self, listData):
-        book = openpyxl.Workbook()
-        book.remove(book.active)
-        sheet1 = book.create_sheet("Статистика по годам")
-        sheet2 = book.create_sheet("Статистика по городам")
-        headingsByYear = ["Год", "Средняя зарплата", f'Средняя зарплата - {self.vacancyName}', "Количество вакансий",
-                          f'Количество вакансий - {self.vacancyName}']
-        headingsByCity = ["Город", "Уровень зарплат", "", "Город", "Доля вакансий"]
-        sheet1.append(headingsByYear)
-        sheet2.append(headingsByCity)
-
-        headingsStyle = NamedStyle(name='headingsStyle')
-        headingsStyle.font = Font(bold=True)
-        headingsStyle.border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'),
-                                      bottom=Side(style='thin'))
-        cellStyle = NamedStyle(name='cellStyle')
-        cellStyle.border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'),
-                                  bottom=Side(style='thin'))
-
-        tempSheet = book.create_sheet("tempSheet")
-        sheet1 = self._CompleteSheet(sheet1, listData, (0, 4))
-        sheet2 = self._CompleteSheet(sheet2, listData, (4, 5), 10)
-        tempSheet = self._CompleteSheet(tempSheet, listData, (5, 6), 10)
-        sheet2 = self.__CopySheetToSheet(tempSheet, sheet2)
-        self.__StyleSheet(sheet1, headingsStyle, cellStyle)
-        self.__StyleSheet(sheet2, headingsStyle, cellStyle)
-        book.remove(tempSheet)
-
-        for cell in sheet2["C"]:
-            cell.border = Border(top=Side(style=None),
-                                 bottom=Side(style=None))
-        for cell in sheet2["E"]:
-            cell.number_format = '0.00%'
-        book.save("report.xlsx")
-
-    def __CreateVerticalBars(self, ax, title, data1, data2, label1, label2, rotation):
-        xIndexes = np.arange(len(data1.keys()))
-        width = 0.35
-        ax.set_title(title)
-        ax.bar(xIndexes - width / 2, data1.values(), width, label=label1)
-        ax.bar(xIndexes + width / 2, data2.values(), width, label=label2)
-        ax.legend()
-        ax.grid(axis="y", visible=True)
-        ax.set_xticks(xIndexes, data1.keys(), rotation=rotation)
-        return ax
-
-    @staticmethod
-    def __CreateHorizontalBar(ax, title, data):
-        width = 0.35
-        ax.set_title(title)
-        ax.barh(list(data.keys())[:10], list(data.values())[:10], width)
-        ax.grid(axis="x", visible=True)
-        ax.invert_yaxis()
-        return ax
-
-    @staticmethod
-    def __CreatePie(ax, title, data):
-        plt.rc('font', size=6)
-        ax.set_title(title)
-        ax.pie(data.values(), labels=data.keys(), labeldistance=1.1, startangle=-30)
-        return ax
+        GenerateStatisticsExcel("report.xlsx", listData, self.vacancyName)
 
     def GenerateImage(self, listData):
-
-        plt.rc('font', size=8)
-        figure = plt.figure()
-        ax1 = figure.add_subplot(2, 2, 1)
-        ax2 = figure.add_subplot(2, 2, 2)
-        ax1 = self.__CreateVerticalBars(ax1, "Уровень зарплат по годам", listData[0], listData[1], "средняя з/п",
-                                        f'з/п {self.vacancyName}', 90)
-        ax2 = self.__CreateVerticalBars(ax2, "Уровень зарплат по годам", listData[2], listData[3],
-                                        "Количество вакансий", f'Количество вакансий {self.vacancyName}', 90)
-
-        ax3 = figure.add_subplot(2, 2, 3)
-        ax3 = self.__CreateHorizontalBar(ax3, "Уровень зарплат по городам", listData[4])
-        plt.rc('font', size=6)
-        tempDict = {k: v for k, v in list(listData[5].items())[:10]}
-        tempDict["Другие"] = sum(list(listData[5].values())[10:])
-        tempDict = dict(sorted(tempDict.items(), key=lambda x: x[1]))
-        ax4 = figure.add_subplot(2, 2, 4)
-        ax4 = self.__CreatePie(ax4, "Доля вакансий по городам", tempDict)
-
-        plt.tight_layout()
-        plt.savefig("graph.png")
-        plt.show()
-
-
+        with open("graph.png", "wb") as file:
+            file.write(ChartRenderer(self.vacancyName, othersFromRest=True).Render(listData))
 
 
 class DataSet:
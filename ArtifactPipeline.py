@@ -0,0 +1,112 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+
+def _TimedCall(func, args):
+    """
+    Выполняет функцию и замеряет время ее работы (вызывается в процессе пула)
+
+    Args:
+        func (callable): Функция
+        args (tuple): Аргументы функции
+
+    Returns:
+        tuple: Результат функции и время выполнения в секундах
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class ArtifactPipeline:
+    """
+    Класс, формирующий артефакты отчета (Excel, изображение, PDF) по графу зависимостей.
+    Каждый артефакт формируется в отдельном процессе и запускается, как только готовы артефакты,
+    от которых он зависит; результаты зависимостей передаются ему последними аргументами.
+
+    Attributes:
+        workers (int): Количество процессов
+        artifacts (dict): Артефакты: название - (функция, аргументы, зависимости)
+        results (dict): Результаты артефактов
+        timings (dict): Время формирования артефактов в секундах
+        wallTime (float): Общее время работы конвейера в секундах
+    """
+
+    def __init__(self, workers=None):
+        """
+        Инициализирует объект ArtifactPipeline
+
+        Args:
+            workers (int): Количество процессов (по умолчанию - по числу артефактов)
+        """
+        self.workers = workers
+        self.artifacts = {}
+        self.results = {}
+        self.timings = {}
+        self.wallTime = 0
+
+    def AddArtifact(self, name, func, *args, dependsOn=()):
+        """
+        Добавляет артефакт в конвейер
+
+        Args:
+            name (str): Название артефакта
+            func (callable): Функция, формирующая артефакт (должна сериализоваться pickle)
+            *args: Аргументы функции
+            dependsOn (tuple[str]): Названия артефактов, результаты которых нужны функции
+        """
+        self.artifacts[name] = (func, args, tuple(dependsOn))
+
+    def __CheckGraph(self):
+        """
+        Проверяет, что все зависимости существуют и граф не содержит циклов
+        """
+        states = {}
+
+        def Visit(name):
+            if states.get(name) == "done":
+                return
+            if states.get(name) == "visiting":
+                raise ValueError(f'Циклическая зависимость артефакта "{name}"')
+            states[name] = "visiting"
+            for dependency in self.artifacts[name][2]:
+                if dependency not in self.artifacts:
+                    raise ValueError(f'Неизвестная зависимость "{dependency}" артефакта "{name}"')
+                Visit(dependency)
+            states[name] = "done"
+
+        for name in self.artifacts:
+            Visit(name)
+
+    def Run(self):
+        """
+        Формирует все артефакты
+
+        Returns:
+            dict: Результаты артефактов
+        """
+        self.__CheckGraph()
+        start = time.perf_counter()
+        waiting = dict(self.artifacts)
+        running = {}
+        with ProcessPoolExecutor(self.workers or len(self.artifacts) or 1) as executor:
+            while waiting or running:
+                for name, (func, args, dependsOn) in list(waiting.items()):
+                    if all(dependency in self.results for dependency in dependsOn):
+                        dependencyResults = tuple(self.results[dependency] for dependency in dependsOn)
+                        running[executor.submit(_TimedCall, func, args + dependencyResults)] = name
+                        del waiting[name]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    self.results[name], self.timings[name] = future.result()
+        self.wallTime = time.perf_counter() - start
+        return self.results
+
+    def PrintTimings(self):
+        """
+        Выводит время формирования каждого артефакта и общее время работы конвейера
+        """
+        for name, seconds in self.timings.items():
+            print(f'{name}: {seconds:.2f} с')
+        print(f'Общее время: {self.wallTime:.2f} с')
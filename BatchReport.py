@@ -0,0 +1,110 @@
+import os
+import re
+import pdfkit
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from jinja2 import Environment, FileSystemLoader
+from PdfReport import Report
+from ReportChart import ChartRenderer
+
+
+class BatchReport:
+    """
+    Класс, формирующий серию PDF отчетов для множества пар (профессия, регион).
+    Шаблон компилируется один раз, одно полотно с графиками переиспользуется для всех отчетов,
+    а преобразование HTML в PDF (отдельный процесс wkhtmltopdf) выполняется в ограниченном пуле потоков.
+
+    Attributes:
+        template (Template): Скомпилированный HTML шаблон отчета
+        pdfConfig (Configuration): Настройки pdfkit
+        workers (int): Количество одновременных преобразований HTML в PDF
+        outputPath (str): Папка для отчетов
+        renderPDF (bool): Преобразовывать ли отчеты в PDF (иначе сохраняется HTML)
+    """
+    options = {'enable-local-file-access': None}
+
+    def __init__(self, templateName="pdfTemplate.html", outputPath="Reports", workers=None,
+                 wkhtmltopdfPath=r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe", renderPDF=True):
+        """
+        Инициализирует объект BatchReport
+
+        Args:
+            templateName (str): Название HTML шаблона
+            outputPath (str): Папка для отчетов
+            workers (int): Количество одновременных преобразований HTML в PDF (по умолчанию - число ядер)
+            wkhtmltopdfPath (str): Путь к wkhtmltopdf
+            renderPDF (bool): Преобразовывать ли отчеты в PDF (иначе сохраняется HTML)
+        """
+        self.template = Environment(loader=FileSystemLoader('.')).get_template(templateName)
+        self.pdfConfig = pdfkit.configuration(wkhtmltopdf=wkhtmltopdfPath) if renderPDF else None
+        self.workers = workers or os.cpu_count()
+        self.outputPath = outputPath
+        self.renderPDF = renderPDF
+        os.makedirs(outputPath, exist_ok=True)
+
+    def GetFileName(self, vacancyName, areaName):
+        """
+        Формирует название файла отчета для пары (профессия, регион)
+
+        Args:
+            vacancyName (str): Название профессии
+            areaName (str): Название региона
+
+        Returns:
+            str: Путь к файлу отчета
+        """
+        name = re.sub(r'[\\/:*?"<>|]', "_", f'report ({vacancyName}, {areaName})')
+        return os.path.join(self.outputPath, f'{name}.{"pdf" if self.renderPDF else "html"}')
+
+    def __SaveReport(self, html, fileName):
+        """
+        Сохраняет отчет в PDF (или HTML, если преобразование в PDF отключено)
+
+        Args:
+            html (str): HTML отчета
+            fileName (str): Путь к файлу отчета
+
+        Returns:
+            str: Путь к файлу отчета
+        """
+        if self.renderPDF:
+            pdfkit.from_string(html, fileName, configuration=self.pdfConfig, options=self.options)
+        else:
+            with open(fileName, "w", encoding="utf-8") as file:
+                file.write(html)
+        return fileName
+
+    def GenerateReports(self, datasets):
+        """
+        Формирует отчеты для всех наборов данных.
+        Графики и HTML формируются последовательно на одном полотне,
+        сохранение отчетов выполняется параллельно (не более 2 * workers отчетов в очереди)
+
+        Args:
+            datasets (iterable): Наборы данных вида (vacancyName, areaName, listData),
+                listData - данные файла в формате PdfReport.Report
+
+        Returns:
+            list[str]: Пути к файлам отчетов (в порядке наборов данных)
+        """
+        figure = None
+        futures, pending = [], set()
+        with ThreadPoolExecutor(self.workers) as executor:
+            for vacancyName, areaName, listData in datasets:
+                report = Report(vacancyName, areaName)
+                renderer = report.CreateChartRenderer()
+                chartData = report.GetChartData(listData)
+                if figure is None:
+                    figure = renderer.CreateFigure(chartData)
+                else:
+                    renderer.UpdateFigure(figure, chartData)
+                image = ChartRenderer.ToDataURI(ChartRenderer.RenderFigure(figure))
+                html = self.template.render(report.GetTemplateData(listData, image))
+
+                if len(pending) >= 2 * self.workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                future = executor.submit(self.__SaveReport, html, self.GetFileName(vacancyName, areaName))
+                futures.append(future)
+                pending.add(future)
+        return [future.result() for future in futures]
@@ -0,0 +1,86 @@
+import argparse
+import os
+import random
+import shutil
+import time
+import pdfkit
+from jinja2 import Environment, FileSystemLoader
+from BatchReport import BatchReport
+from PdfReport import Report
+
+
+def GenerateDatasets(count, seed=0):
+    """
+    Формирует синтетические наборы данных (профессия, регион, данные файла) для замера производительности
+
+    Args:
+        count (int): Количество наборов данных
+        seed (int): Начальное значение генератора случайных чисел
+
+    Returns:
+        list[tuple]: Наборы данных вида (vacancyName, areaName, listData)
+    """
+    randomizer = random.Random(seed)
+    years = range(2007, 2023)
+    cities = [f'Город {i}' for i in range(30)]
+    datasets = []
+    for i in range(count):
+        salaries = {year: randomizer.randint(30000, 150000) for year in years}
+        counts = {year: randomizer.randint(1000, 100000) for year in years}
+        vacancySalaries = {year: randomizer.randint(30000, 200000) for year in years}
+        vacancyCounts = {year: randomizer.randint(10, 5000) for year in years}
+        citySalaries = dict(sorted({city: randomizer.randint(30000, 150000) for city in
+                                    randomizer.sample(cities, 12)}.items(), key=lambda x: x[1], reverse=True))
+        cityRatios = dict(sorted({city: round(randomizer.uniform(0.01, 0.08), 4) for city in
+                                  randomizer.sample(cities, 12)}.items(), key=lambda x: x[1], reverse=True))
+        datasets.append((f'Профессия {i % 50}', f'Регион {i // 50}',
+                         [salaries, counts, vacancySalaries, vacancyCounts, citySalaries, cityRatios]))
+    return datasets
+
+
+def RunSequential(datasets, outputPath, renderPDF, wkhtmltopdfPath):
+    """
+    Формирует отчеты по одному, как PdfReport.Report.GeneratePDF:
+    новое окружение Jinja, новое полотно и новый процесс wkhtmltopdf на каждый отчет
+    """
+    for i, (vacancyName, areaName, listData) in enumerate(datasets):
+        report = Report(vacancyName, areaName)
+        image = report.GenerateImage(listData)
+        template = Environment(loader=FileSystemLoader('.')).get_template("pdfTemplate.html")
+        html = template.render(report.GetTemplateData(listData, image))
+        if renderPDF:
+            config = pdfkit.configuration(wkhtmltopdf=wkhtmltopdfPath)
+            pdfkit.from_string(html, os.path.join(outputPath, f'{i}.pdf'), configuration=config,
+                               options={'enable-local-file-access': None})
+        else:
+            with open(os.path.join(outputPath, f'{i}.html'), "w", encoding="utf-8") as file:
+                file.write(html)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замер производительности пакетного формирования отчетов")
+    parser.add_argument("--count", type=int, default=500, help="Количество пар (профессия, регион)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Размер пула преобразования в PDF")
+    parser.add_argument("--html", action="store_true", help="Сохранять HTML вместо PDF (без wkhtmltopdf)")
+    parser.add_argument("--wkhtmltopdf", default=shutil.which("wkhtmltopdf") or
+                        r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe", help="Путь к wkhtmltopdf")
+    args = parser.parse_args()
+
+    datasets = GenerateDatasets(args.count)
+    renderPDF = not args.html
+    for name in ("BenchmarkSequential", "BenchmarkBatch"):
+        shutil.rmtree(name, ignore_errors=True)
+        os.makedirs(name)
+
+    start = time.perf_counter()
+    RunSequential(datasets, "BenchmarkSequential", renderPDF, args.wkhtmltopdf)
+    sequentialTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    BatchReport(outputPath="BenchmarkBatch", workers=args.workers, wkhtmltopdfPath=args.wkhtmltopdf,
+                renderPDF=renderPDF).GenerateReports(datasets)
+    batchTime = time.perf_counter() - start
+
+    print(f'Отчетов: {args.count}, формат: {"PDF" if renderPDF else "HTML"}, потоков: {args.workers}')
+    print(f'По одному: {sequentialTime:.1f} с, {args.count / sequentialTime * 60:.0f} отчетов в минуту')
+    print(f'Пакетно: {batchTime:.1f} с, {args.count / batchTime * 60:.0f} отчетов в минуту')
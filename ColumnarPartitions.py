@@ -0,0 +1,81 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+
+class ColumnarPartitions:
+    numericColumns = ("salary_from", "salary_to", "salary")
+    dateColumns = ("published_at",)
+    manifestName = "manifest.json"
+
+    def __init__(self, outputPath):
+        self.outputPath = outputPath
+        manifestFile = os.path.join(outputPath, self.manifestName)
+        if os.path.exists(manifestFile):
+            with open(manifestFile, encoding="utf-8") as file:
+                self.manifest = json.load(file)
+        else:
+            self.manifest = {"partitions": {}}
+
+    def GetPartitionPath(self, key):
+        return self.manifest["partitions"][str(key)]["path"]
+
+    def WritePartition(self, key, csvFileName, partitionPath):
+        os.makedirs(partitionPath, exist_ok=True)
+        df = pd.read_csv(csvFileName, dtype=str, keep_default_na=False)
+        info = {"path": partitionPath, "rows": len(df), "columns": {}, "salaryRanges": {}}
+        for column in df.columns:
+            values = df[column]
+            if column in self.numericColumns:
+                array = pd.to_numeric(values.replace("", np.nan)).to_numpy(dtype=np.float64)
+                np.save(os.path.join(partitionPath, f'{column}.npy'), array)
+                info["columns"][column] = "float64"
+                hasValues = len(array) > 0 and not np.isnan(array).all()
+                info["salaryRanges"][column] = [float(np.nanmin(array)), float(np.nanmax(array))] if hasValues else None
+            elif column in self.dateColumns:
+                array = pd.to_datetime(values.str[:19]).to_numpy(dtype="datetime64[s]")
+                np.save(os.path.join(partitionPath, f'{column}.npy'), array)
+                info["columns"][column] = "datetime64[s]"
+                info["publishedFrom"] = values.min() if len(values) else None
+                info["publishedTo"] = values.max() if len(values) else None
+            else:
+                # Пустая строка - пропуск (код -1), как NaN при чтении CSV в pandas
+                codes, uniques = pd.factorize(values.replace("", np.nan))
+                np.save(os.path.join(partitionPath, f'{column}.codes.npy'), codes.astype(np.int32))
+                np.save(os.path.join(partitionPath, f'{column}.values.npy'), np.asarray(uniques, dtype=str))
+                info["columns"][column] = "dictionary"
+                if column == "area_name":
+                    info["areas"] = len(uniques)
+        self.manifest["partitions"][str(key)] = info
+        return info
+
+    def SaveManifest(self, **parameters):
+        self.manifest.update(parameters)
+        with open(os.path.join(self.outputPath, self.manifestName), "w", encoding="utf-8") as file:
+            json.dump(self.manifest, file, ensure_ascii=False, indent=2)
+
+    def SelectPartitions(self, where=None):
+        # where - функция от записи манифеста; партиции, для которых она ложна, не читаются
+        return [key for key, info in self.manifest["partitions"].items() if where is None or where(info)]
+
+    def LoadPartition(self, key, columns=None):
+        return self.LoadColumns(self.GetPartitionPath(key), columns)
+
+    @staticmethod
+    def IsPartition(path):
+        return os.path.isdir(path)
+
+    @staticmethod
+    def LoadColumns(partitionPath, columns=None):
+        if columns is None:
+            columns = sorted({name.split(".")[0] for name in os.listdir(partitionPath) if name.endswith(".npy")})
+        data = {}
+        for column in columns:
+            codesFile = os.path.join(partitionPath, f'{column}.codes.npy')
+            if os.path.exists(codesFile):
+                values = np.load(os.path.join(partitionPath, f'{column}.values.npy'))
+                data[column] = pd.Categorical.from_codes(np.load(codesFile), categories=values)
+            else:
+                data[column] = np.load(os.path.join(partitionPath, f'{column}.npy'), mmap_mode="r")
+        return pd.DataFrame(data)
@@ -0,0 +1,134 @@
+import argparse
+import csv
+import io
+import mmap
+import os
+import numpy as np
+
+bufferSize = 16 << 20
+
+
+class CsvRowIndex:
+    # Индекс начал записей CSV файла в {fileName}.idx: два uint64 (размер и mtime файла, по которым индекс
+    # проверяется на актуальность), затем uint64 смещения начал записей, первая - заголовок.
+    # Перевод строки внутри кавычек запись не завершает, пустые строки записями не считаются.
+    # Индекс строится за один проход и открывается через mmap, как и сам файл, поэтому строка N,
+    # диапазон строк и случайная выборка читаются без чтения файла с начала
+    def __init__(self, fileName, indexFileName=None):
+        self.fileName = fileName
+        self.indexFileName = indexFileName or f'{fileName}.idx'
+        stat = os.stat(fileName)
+        self.size = stat.st_size
+        if not self.IsActual(stat):
+            self.Build(stat)
+        with open(self.indexFileName, "rb") as file:
+            self.indexMap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.offsets = np.frombuffer(self.indexMap, dtype="<u8", offset=16)
+        self.fileMap = None
+        if self.size:
+            with open(fileName, "rb") as file:
+                self.fileMap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.columns = next(csv.reader([self.GetRecord(0).decode("utf-8-sig")]), []) if len(self.offsets) else []
+
+    def IsActual(self, stat):
+        if not os.path.exists(self.indexFileName) or os.path.getsize(self.indexFileName) < 16:
+            return False
+        with open(self.indexFileName, "rb") as file:
+            size, mtime = np.frombuffer(file.read(16), dtype="<u8")
+        return size == stat.st_size and mtime == stat.st_mtime_ns
+
+    def Build(self, stat):
+        # Запись заканчивается переводом строки вне кавычек: число кавычек от начала файла до него четное.
+        # Четность считается накопленным xor по блокам, остаток переносится в следующий блок
+        starts, parity = [np.zeros(1, dtype="<u8")], 0
+        with open(self.fileName, "rb") as file:
+            position = 0
+            while True:
+                block = file.read(bufferSize)
+                if not block:
+                    break
+                data = np.frombuffer(block, dtype=np.uint8)
+                isQuoted = np.bitwise_xor.accumulate((data == ord('"')).view(np.uint8)) ^ parity
+                ends = np.flatnonzero((data == ord("\n")) & (isQuoted == 0))
+                starts.append((ends + position + 1).astype("<u8"))
+                parity = int(isQuoted[-1])
+                position += len(block)
+        starts = np.concatenate(starts)
+        starts = starts[starts < stat.st_size]
+        # Пустые строки ("\n" и "\r\n") отбрасываются
+        lengths = np.diff(starts, append=np.uint64(stat.st_size))
+        candidates = np.flatnonzero(lengths <= 2)
+        if len(candidates):
+            with open(self.fileName, "rb") as file:
+                isBlank = np.zeros(len(starts), dtype=bool)
+                for i in candidates:
+                    file.seek(int(starts[i]))
+                    isBlank[i] = file.read(int(lengths[i])) in (b"\n", b"\r\n")
+            starts = starts[~isBlank]
+        with open(f'{self.indexFileName}.tmp', "wb") as file:
+            file.write(np.array([stat.st_size, stat.st_mtime_ns], dtype="<u8").tobytes())
+            file.write(starts.tobytes())
+        os.replace(f'{self.indexFileName}.tmp', self.indexFileName)
+
+    def __len__(self):
+        # Количество строк данных, без заголовка
+        return max(len(self.offsets) - 1, 0)
+
+    def GetRecord(self, record):
+        end = int(self.offsets[record + 1]) if record + 1 < len(self.offsets) else self.size
+        return self.fileMap[int(self.offsets[record]):end]
+
+    def GetRow(self, row):
+        if not 0 <= row < len(self):
+            raise IndexError(f'Строки {row} нет в файле, строк: {len(self)}')
+        return next(csv.reader([self.GetRecord(row + 1).decode("utf-8")]))
+
+    def GetRows(self, start, end):
+        # Строки [start, end) одним чтением подряд идущих байтов
+        start, end = max(start, 0), min(end, len(self))
+        if start >= end:
+            return []
+        last = int(self.offsets[end + 1]) if end + 1 < len(self.offsets) else self.size
+        text = self.fileMap[int(self.offsets[start + 1]):last].decode("utf-8")
+        # Пустые строки внутри диапазона в индекс не входят и пропускаются
+        return [row for row in csv.reader(io.StringIO(text, newline="")) if row]
+
+    def GetSample(self, count, seed=None):
+        rows = np.random.default_rng(seed).choice(len(self), min(count, len(self)), replace=False)
+        return [self.GetRow(int(row)) for row in np.sort(rows)]
+
+    def GetByteBoundaries(self, start, end, parts):
+        # Начала записей, ближайшие к делению диапазона байтов [start, end) на parts частей
+        targets = [start + (end - start) * i // parts for i in range(1, parts)]
+        positions = np.searchsorted(self.offsets, np.array(targets, dtype="<u8"))
+        boundaries = [start]
+        for position in positions:
+            boundary = int(self.offsets[position]) if position < len(self.offsets) else end
+            boundaries.append(min(max(boundary, boundaries[-1]), end))
+        return boundaries + [end]
+
+    def Close(self):
+        # Массив смещений ссылается на mmap, поэтому сначала удаляется он
+        self.offsets = None
+        self.indexMap.close()
+        if self.fileMap is not None:
+            self.fileMap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.Close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Просмотр строк CSV файла по индексу записей")
+    parser.add_argument("fileName")
+    parser.add_argument("--rows", type=int, nargs=2, metavar=("START", "END"), help="Строки [START, END)")
+    parser.add_argument("--sample", type=int, help="Случайная выборка строк")
+    args = parser.parse_args()
+    with CsvRowIndex(args.fileName) as index:
+        print(f'Строк: {len(index)}, колонки: {", ".join(index.columns)}')
+        rows = index.GetSample(args.sample) if args.sample else index.GetRows(*(args.rows or (0, 10)))
+        for row in rows:
+            print(row)
@@ -0,0 +1,196 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    # Windows: пиковая память и время процессора не замеряются
+    resource = None
+
+names = ["Программист Python", "Java разработчик", "Аналитик данных", "Системный аналитик", "Менеджер по продажам",
+         "Бухгалтер", "Водитель", "Инженер, ведущий", "Frontend-разработчик", "Тестировщик"]
+areas = ["Москва", "Санкт-Петербург", "Новосибирск", "Екатеринбург", "Казань", "Нижний Новгород", "Краснодар",
+         "Самара", "Ростов-на-Дону", "Уфа", "Омск", "Воронеж", "Пермь", "Красноярск", "Алматы", "Минск",
+         "Ташкент", "Тула", "Тверь", "Ярославль", "Челябинск", "Иркутск", "Томск", "Сочи", "Калининград"]
+# Доли валют как в DistributorVacancies.csv: без зарплаты - почти половина вакансий
+currencies = {"RUR": (0.512, 1), "": (0.446, 0), "KZT": (0.016, 0.13), "USD": (0.0085, 60),
+              "BYR": (0.0085, 23), "UZS": (0.005, 0.0055), "EUR": (0.0032, 63), "KGS": (0.0007, 0.76)}
+strategies = ["serial", "threads", "processes", "auto"]
+modes = ["disk", "memory"]
+
+
+def GenerateVacancies(fileName, rows, seed=0, chunkRows=1000000):
+    # Годы 2003-2022 с ростом числа вакансий на 30% в год, города - по закону Ципфа, валюты - как в выгрузке HH
+    randomizer = np.random.default_rng(seed)
+    years = np.arange(2003, 2023)
+    yearWeights = 1.3 ** np.arange(len(years))
+    areaWeights = 1 / np.arange(1, len(areas) + 1) ** 1.2
+    currencyNames = list(currencies)
+    currencyWeights = np.array([share for share, _ in currencies.values()])
+    rates = np.array([rate for _, rate in currencies.values()])
+    header = True
+    for start in range(0, rows, chunkRows):
+        count = min(chunkRows, rows - start)
+        currencyCodes = randomizer.choice(len(currencyNames), count, p=currencyWeights / currencyWeights.sum())
+        salaryFrom = randomizer.integers(10, 300, count) * 1000.0 / np.where(rates[currencyCodes] > 0,
+                                                                             rates[currencyCodes], 1)
+        salaryTo = salaryFrom * randomizer.uniform(1, 1.5, count)
+        hasSalary = rates[currencyCodes] > 0
+        df = pd.DataFrame({
+            "name": np.array(names)[randomizer.integers(0, len(names), count)],
+            "salary_from": np.where(hasSalary, salaryFrom.round(), np.nan),
+            "salary_to": np.where(hasSalary, salaryTo.round(), np.nan),
+            "salary_currency": np.array(currencyNames)[currencyCodes],
+            "salary": np.where(hasSalary, (salaryFrom.round() + salaryTo.round()) / 2 * rates[currencyCodes], np.nan),
+            "area_name": np.array(areas)[randomizer.choice(len(areas), count, p=areaWeights / areaWeights.sum())],
+            "published_at": [f'{year}-{month:02}-{day:02}T10:00:00+0300' for year, month, day in zip(
+                randomizer.choice(years, count, p=yearWeights / yearWeights.sum()),
+                randomizer.integers(1, 13, count), randomizer.integers(1, 29, count))]})
+        df.to_csv(fileName, mode="w" if header else "a", header=header, index=False)
+        header = False
+
+
+def GetPeakRss():
+    # На Linux ru_maxrss сохраняется при exec и включает пик родительского процесса бенчмарка,
+    # поэтому для текущего процесса берется VmHWM, который сбрасывается при exec
+    if os.path.exists("/proc/self/status"):
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    # ru_maxrss - в килобайтах на Linux и в байтах на macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def GetResourceUsage():
+    # Время процессора и пиковая память текущего процесса и его завершившихся дочерних процессов (пула)
+    if resource is None:
+        return None, None
+    own, children = resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpuTime = own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+    return cpuTime, max(GetPeakRss(), children.ru_maxrss * (1 if sys.platform == "darwin" else 1024))
+
+
+def RunSingle(fileName, strategy, mode, vacancyName, granularity):
+    # Один замер в отдельном процессе, чтобы пиковая память и время процессора не смешивались с другими замерами
+    from Splitter import Splitter
+    from SharedPartitions import SharedPartitions
+    from DynamicsCalculator import Calculator
+    from DynamicsExecutor import DynamicsExecutor
+    outputPath = f'{fileName}.partitions'
+    shutil.rmtree(outputPath, ignore_errors=True)
+    # Время процессора на запуск интерпретатора и импорт модулей не учитывается
+    startCpuTime, _ = GetResourceUsage()
+    start = time.perf_counter()
+    if mode == "memory":
+        splitter = SharedPartitions(fileName, granularity=granularity)
+    else:
+        splitter = Splitter(fileName, outputPath, "Data", granularity=granularity)
+    splitTime = time.perf_counter() - start
+    executor = DynamicsExecutor(strategy)
+    dynamicsCalculator = Calculator(vacancyName)
+    try:
+        res = executor.Run(dynamicsCalculator.GetDynamicsByYear,
+                           [(splitter.GetFileName(partition), partition)
+                            for partition in dynamicsCalculator.SelectPartitions(splitter)])
+    finally:
+        if mode == "memory":
+            splitter.Close()
+    with contextlib.redirect_stdout(io.StringIO()):
+        dynamicsCalculator.HandleResults(res)
+    wallTime = time.perf_counter() - start
+    cpuTime, peakRss = GetResourceUsage()
+    shutil.rmtree(outputPath, ignore_errors=True)
+    cpuTime = cpuTime - startCpuTime if cpuTime is not None else None
+    return {"splitTime": splitTime, "calculationTime": executor.wallTime, "wallTime": wallTime, "cpuTime": cpuTime,
+            "peakRss": peakRss, "partitions": len(res), "usedStrategy": executor.usedStrategy,
+            "workers": executor.usedWorkers}
+
+
+def GetEnvironment():
+    return {"python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__,
+            "platform": platform.platform(), "cpuCount": os.cpu_count(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def CompareResults(results, previousFileName, tolerance):
+    # Сравнение строк в секунду с предыдущим файлом результатов: замедление больше tolerance - регрессия
+    with open(previousFileName, encoding="utf-8") as file:
+        previous = {(run["rows"], run["strategy"], run["mode"]): run for run in json.load(file)["runs"]}
+    regressions = 0
+    for run in results["runs"]:
+        old = previous.get((run["rows"], run["strategy"], run["mode"]))
+        if old is None:
+            continue
+        ratio = run["rowsPerSecond"] / old["rowsPerSecond"]
+        isRegression = ratio < 1 - tolerance
+        regressions += isRegression
+        print(f'{run["rows"]:>10} {run["strategy"]:>9} {run["mode"]:>6}: {ratio:6.2f}x'
+              f'{"  РЕГРЕССИЯ" if isRegression else ""}')
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замер стратегий выполнения Splitter + Calculator")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000, 10000000, 50000000],
+                        help="Количество строк синтетических файлов")
+    parser.add_argument("--strategies", nargs="+", default=strategies, choices=strategies)
+    parser.add_argument("--modes", nargs="+", default=modes, choices=modes,
+                        help="disk - партиции в CSV файлах, memory - в разделяемой памяти")
+    parser.add_argument("--granularity", default="month", choices=["year", "quarter", "month"])
+    parser.add_argument("--vacancy", default="аналитик", help="Профессия для расчета")
+    parser.add_argument("--repeat", type=int, default=1, help="Количество повторов, берется лучший")
+    parser.add_argument("--dataPath", default="DynamicsBenchmarkData", help="Папка синтетических файлов")
+    parser.add_argument("--output", default="DynamicsBenchmark.json", help="Файл результатов")
+    parser.add_argument("--compare", help="Предыдущий файл результатов для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Допустимое замедление при сравнении")
+    parser.add_argument("--single", nargs=2, metavar=("FILE", "STRATEGY_MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        strategy, mode = args.single[1].split(":")
+        print(json.dumps(RunSingle(args.single[0], strategy, mode, args.vacancy, args.granularity)))
+        sys.exit()
+
+    os.makedirs(args.dataPath, exist_ok=True)
+    results = {"environment": GetEnvironment(), "granularity": args.granularity, "runs": []}
+    for rows in args.rows:
+        fileName = os.path.join(args.dataPath, f'Vacancies{rows}.csv')
+        if not os.path.exists(fileName):
+            start = time.perf_counter()
+            GenerateVacancies(fileName, rows)
+            print(f'Сгенерирован {fileName}: {os.path.getsize(fileName) / (1 << 20):.0f} МБ, '
+                  f'{time.perf_counter() - start:.1f} с')
+        for strategy in args.strategies:
+            for mode in args.modes:
+                measurements = []
+                for _ in range(args.repeat):
+                    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--single", fileName,
+                                             f'{strategy}:{mode}', "--vacancy", args.vacancy,
+                                             "--granularity", args.granularity],
+                                            capture_output=True, text=True, check=True).stdout
+                    measurements.append(json.loads(output.splitlines()[-1]))
+                run = min(measurements, key=lambda measurement: measurement["wallTime"])
+                run.update({"rows": rows, "strategy": strategy, "mode": mode, "fileSize": os.path.getsize(fileName),
+                            "rowsPerSecond": rows / run["wallTime"],
+                            "cpuUtilization": run["cpuTime"] / run["wallTime"] if run["cpuTime"] else None})
+                results["runs"].append(run)
+                peakRss = f'{run["peakRss"] / (1 << 20):.0f} МБ' if run["peakRss"] else "-"
+                cpuUtilization = f'{run["cpuUtilization"]:.2f}' if run["cpuUtilization"] else "-"
+                print(f'{rows:>10} строк, {strategy:>9} ({run["usedStrategy"]}, {run["workers"]}), {mode:>6}: '
+                      f'{run["wallTime"]:7.2f} с, {run["rowsPerSecond"]:10.0f} строк/с, '
+                      f'CPU {cpuUtilization}, пик памяти {peakRss}')
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+    if args.compare:
+        sys.exit(1 if CompareResults(results, args.compare, args.tolerance) else 0)
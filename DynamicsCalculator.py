@@ -1,61 +1,126 @@
-import pandas as pd
+import numpy as np
+from ColumnarPartitions import ColumnarPartitions
+from SharedPartitions import SharedPartitions
+from Splitter import GetPartitionYear
+from VacancyLoader import LoadVacancies
 
 
 class Calculator:
-    def __init__(self, vacancyName, areaName):
+    columns = ["name", "salary", "area_name"]
+    # Остальные типы - из схемы VacancyLoader
+    dtypes = {"name": "category"}
+
+    def __init__(self, vacancyName, areaName=None, ignoreCase=False, regex=False, years=None):
+        # vacancyName ищется в названии вакансии как подстрока (regex=True - как регулярное выражение),
+        # ignoreCase - без учета регистра; areaName=None - все регионы.
+        # years - учитываются только вакансии этих лет (None - все годы), партиции других лет не читаются
         self.vacancyName = vacancyName
         self.areaName = areaName
+        self.ignoreCase = ignoreCase
+        self.regex = regex
+        self.years = None if years is None else set(years)
+
+    def SelectPartitions(self, splitter):
+        # Партиции выбранных лет. Для колонок NumPy отбор идет по манифесту, сами партиции не открываются
+        if getattr(splitter, "outputFormat", None) == "npy":
+            selected = set(ColumnarPartitions(splitter.outputPath).SelectPartitions(self.IsPartitionNeeded))
+            return [partition for partition in splitter.partitions if str(partition) in selected]
+        return [partition for partition in splitter.partitions
+                if self.years is None or GetPartitionYear(partition) in self.years]
 
-    def GetDynamicsByYear(self, fileName, year):
-        generalDf = self.GetDataByYear(fileName, areaName=self.areaName)
-        dfByParameters = self.GetDataByYear(fileName, self.vacancyName, self.areaName)
-        res = (year, self.GetSalariesData(generalDf), self.GetDataCount(generalDf),
-               self.GetSalariesData(dfByParameters), self.GetDataCount(dfByParameters))
+    def IsPartitionNeeded(self, info):
+        # Запись манифеста ColumnarPartitions; партиция не больше года, поэтому год - по первой дате публикации
+        if self.years is None:
+            return True
+        return info["publishedFrom"] is not None and int(info["publishedFrom"][0:4]) in self.years
+
+    def GetDynamicsByYear(self, fileName, partition):
+        # Возвращает суммы зарплат и количества, а не средние: партиция может быть частью года,
+        # средние по году считаются в HandleResults после сложения частей.
+        # Последний элемент - все строки партиции, включая строки без города: доли городов считаются от него.
+        # Партиция читается один раз, выборки по региону и профессии - булевы маски
+        df = self.GetDataByYear(fileName)
+        areaMask = self.GetAreaMask(df["area_name"])
+        vacancyMask = areaMask & self.GetVacancyMask(df["name"])
+        salaries = df["salary"].to_numpy(dtype="float64")
+        res = (partition, self.GetSalariesSum(salaries, areaMask), int(areaMask.sum()),
+               self.GetSalariesSum(salaries, vacancyMask), int(vacancyMask.sum()),
+               self.GetCitiesSums(df["area_name"], salaries), len(df))
         return res
 
-    def GetDataByYear(self, fileName, vacancyName=None, areaName=None):
-        df = pd.read_csv(fileName)
-        if areaName is not None:
-            df = df[df["area_name"] == areaName]
-        if vacancyName is not None:
-            df = df[df["name"].str.contains(vacancyName)]
-        return df
-
-    def GetSalariesData(self, df):
-        return int(df["salary"].mean()) if len(df) > 0 else 0
-
-    def GetDataCount(self, df):
-        return len(df)
-
-    def GetDynamicsByCity(self, fileName):
-        df = pd.read_csv(fileName)
-        df['count'] = df.groupby('area_name')['area_name'].transform('count')
-        vacanciesCount = len(df)
-        tempDf = df[df['count'] / vacanciesCount >= 0.01]
-        return self.GetCitySalariesData(tempDf), self.GetCityRatioData(tempDf, vacanciesCount)
-
-    def GetCitySalariesData(self, df):
-        tempDf = df.copy()
-        tempDf = tempDf.groupby('area_name')['salary'].mean().sort_values(ascending=False)
-        tempDf = tempDf.head(10).apply(lambda x: int(x)).to_dict()
-        return tempDf
-
-    def GetCityRatioData(self, df, vacanciesCount):
-        tempDf = df.copy()
-        tempDf["ratio"] = (tempDf["count"] / vacanciesCount)
-        tempDf = tempDf.groupby('area_name')['ratio'].mean().sort_values(ascending=False)
-        tempDf = tempDf.head(10).apply(lambda x: round(x, 4)).to_dict()
-        return tempDf
+    def GetDataByYear(self, fileName):
+        if SharedPartitions.IsSlice(fileName):
+            return fileName.LoadColumns(self.columns)
+        if ColumnarPartitions.IsPartition(fileName):
+            return ColumnarPartitions.LoadColumns(fileName, self.columns)
+        return LoadVacancies(fileName, self.columns, dtype=self.dtypes)
+
+    def GetAreaMask(self, areas):
+        # Сравнивается код категории, а не строки
+        areas = areas.astype("category")
+        if self.areaName is None:
+            return np.ones(len(areas), dtype=bool)
+        categories = areas.cat.categories
+        if self.areaName not in categories:
+            return np.zeros(len(areas), dtype=bool)
+        return areas.cat.codes.to_numpy() == categories.get_loc(self.areaName)
+
+    def GetVacancyMask(self, names):
+        # Подстрока ищется один раз в каждом уникальном названии, строки получают результат по коду категории
+        names = names.astype("category")
+        matches = names.cat.categories.str.contains(self.vacancyName, case=not self.ignoreCase, regex=self.regex)
+        # Код -1 (пустое название) попадает на последний элемент - False
+        return np.append(np.asarray(matches, dtype=bool), False)[names.cat.codes.to_numpy()]
+
+    def GetSalariesSum(self, salaries, mask):
+        # Сумма и количество непустых зарплат - из них складывается среднее по нескольким партициям
+        values = salaries[mask]
+        return float(np.nansum(values)), int(np.count_nonzero(~np.isnan(values)))
+
+    def GetCitiesSums(self, areas, salaries):
+        # По всем строкам партиции: город - (сумма зарплат, количество непустых зарплат, количество вакансий)
+        areas = areas.astype("category")
+        codes = areas.cat.codes.to_numpy()
+        hasArea = codes >= 0
+        codes, salaries = codes[hasArea], salaries[hasArea]
+        hasSalary = ~np.isnan(salaries)
+        length = len(areas.cat.categories)
+        sums = np.bincount(codes[hasSalary], weights=salaries[hasSalary], minlength=length)
+        salariesCounts = np.bincount(codes[hasSalary], minlength=length)
+        counts = np.bincount(codes, minlength=length)
+        return {area: (float(sums[i]), int(salariesCounts[i]), int(counts[i]))
+                for i, area in enumerate(areas.cat.categories) if counts[i] > 0}
+
+    def GetDynamicsByCity(self, citiesSums, vacanciesCount):
+        # Доля и уровень зарплат считаются по сложенным частям всех партиций, vacanciesCount - все строки,
+        # включая строки без города. Учитываются города, в которых не меньше 1% вакансий
+        cities = {area: sums for area, sums in citiesSums.items() if sums[2] / vacanciesCount >= 0.01}
+        citiesSalaries = sorted(((area, total / salariesCount) for area, (total, salariesCount, _) in cities.items()
+                                 if salariesCount > 0), key=lambda x: x[1], reverse=True)
+        citiesRatios = sorted(((area, count / vacanciesCount) for area, (_, _, count) in cities.items()),
+                              key=lambda x: x[1], reverse=True)
+        return ({area: int(salary) for area, salary in citiesSalaries[:10]},
+                {area: round(ratio, 4) for area, ratio in citiesRatios[:10]})
 
     def HandleResults(self, result):
-        generalSalaries, generalCount, vacancySalaries, vacancyCount = {}, {}, {}, {}
-        for dataYear in result:
-            generalSalaries[dataYear[0]] = dataYear[1]
-            generalCount[dataYear[0]] = dataYear[2]
-            vacancySalaries[dataYear[0]] = dataYear[3]
-            vacancyCount[dataYear[0]] = dataYear[4]
+        generalSums, generalCount, vacancySums, vacancyCount, citiesSums = {}, {}, {}, {}, {}
+        vacanciesCount = 0
+        for dataPartition in result:
+            year = GetPartitionYear(dataPartition[0])
+            generalSums[year] = [a + b for a, b in zip(generalSums.get(year, (0, 0)), dataPartition[1])]
+            generalCount[year] = generalCount.get(year, 0) + dataPartition[2]
+            vacancySums[year] = [a + b for a, b in zip(vacancySums.get(year, (0, 0)), dataPartition[3])]
+            vacancyCount[year] = vacancyCount.get(year, 0) + dataPartition[4]
+            for area, sums in dataPartition[5].items():
+                citiesSums[area] = [a + b for a, b in zip(citiesSums.get(area, (0, 0, 0)), sums)]
+            vacanciesCount += dataPartition[6]
+        generalSalaries = {year: int(total / count) if count > 0 else 0 for year, (total, count) in generalSums.items()}
+        vacancySalaries = {year: int(total / count) if count > 0 else 0 for year, (total, count) in vacancySums.items()}
         print("Динамика уровня зарплат по годам и региону:", generalSalaries)
         print("Динамика количества вакансий по годам и региону:", generalCount)
         print("Динамика уровня зарплат по годам для выбранной профессии:", vacancySalaries)
         print("Динамика количества вакансий по годам для выбранной профессии:", vacancyCount)
-        return generalSalaries, generalCount, vacancySalaries, vacancyCount
\ No newline at end of file
+        citiesSalaryData, citiesRatioData = self.GetDynamicsByCity(citiesSums, vacanciesCount)
+        print("Уровень зарплат по городам (в порядке убывания):", citiesSalaryData)
+        print("Доля вакансий по городам (в порядке убывания):", citiesRatioData)
+        return generalSalaries, generalCount, vacancySalaries, vacancyCount, citiesSalaryData, citiesRatioData
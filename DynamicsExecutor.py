@@ -0,0 +1,90 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from SharedPartitions import SharedPartitions
+
+
+def TimedCall(func, args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def GetPartitionSize(fileName):
+    if SharedPartitions.IsSlice(fileName):
+        return fileName.GetSize()
+    if os.path.isdir(fileName):
+        return sum(os.path.getsize(os.path.join(fileName, name)) for name in os.listdir(fileName))
+    return os.path.getsize(fileName)
+
+
+class DynamicsExecutor:
+    strategies = ("serial", "threads", "processes", "auto")
+    # Меньше этого объема данных пул не окупает запуск процессов
+    serialThreshold = 16 << 20
+
+    def __init__(self, strategy="auto", workers=None, memoryBudget=1 << 30):
+        # strategy: "serial", "threads", "processes" или "auto" - выбор по объему данных и числу ядер.
+        # workers - наибольший размер пула (по умолчанию - число ядер), memoryBudget - наибольший суммарный
+        # размер партиций (в байтах), которые обрабатываются одновременно
+        if strategy not in self.strategies:
+            raise ValueError(f'Неизвестный способ выполнения "{strategy}", возможные: {", ".join(self.strategies)}')
+        self.strategy = strategy
+        self.workers = workers
+        self.memoryBudget = memoryBudget
+        self.log = []
+        self.usedStrategy, self.usedWorkers, self.wallTime = None, None, 0
+
+    def GetWorkers(self, sizes):
+        # Процессов больше, чем партиций, или больше, чем раз самая большая партиция помещается в общий объем,
+        # не нужно: время все равно не меньше времени самой большой партиции
+        cores = self.workers or os.cpu_count() or 1
+        largest = max(sizes, default=0)
+        if largest == 0:
+            return max(1, min(cores, len(sizes)))
+        return max(1, min(cores, len(sizes), math.ceil(sum(sizes) / largest), self.memoryBudget // largest))
+
+    def GetStrategy(self, sizes, workers):
+        if self.strategy != "auto":
+            return self.strategy
+        return "serial" if workers <= 1 or sum(sizes) < self.serialThreshold else "processes"
+
+    def Run(self, func, tasks):
+        # tasks - аргументы func вида (fileName, partition); результаты возвращаются в порядке tasks.
+        # Партиции запускаются от большей к меньшей, новая не запускается, пока не хватает бюджета памяти
+        start = time.perf_counter()
+        sizes = [GetPartitionSize(task[0]) for task in tasks]
+        self.usedWorkers = self.GetWorkers(sizes)
+        self.usedStrategy = self.GetStrategy(sizes, self.usedWorkers)
+        order = sorted(range(len(tasks)), key=lambda i: sizes[i], reverse=True)
+        results = [None] * len(tasks)
+        self.log = []
+        if self.usedStrategy == "serial":
+            for i in order:
+                results[i], seconds = TimedCall(func, tasks[i])
+                self.log.append((tasks[i][1], sizes[i], seconds))
+        else:
+            poolExecutor = ProcessPoolExecutor if self.usedStrategy == "processes" else ThreadPoolExecutor
+            running, bytesInFlight = {}, 0
+            with poolExecutor(self.usedWorkers) as executor:
+                while order or running:
+                    while order and len(running) < self.usedWorkers and \
+                            (not running or bytesInFlight + sizes[order[0]] <= self.memoryBudget):
+                        i = order.pop(0)
+                        running[executor.submit(TimedCall, func, tasks[i])] = i
+                        bytesInFlight += sizes[i]
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        i = running.pop(future)
+                        bytesInFlight -= sizes[i]
+                        results[i], seconds = future.result()
+                        self.log.append((tasks[i][1], sizes[i], seconds))
+        self.wallTime = time.perf_counter() - start
+        return results
+
+    def PrintTimings(self):
+        for partition, size, seconds in self.log:
+            print(f'{partition}: {size / (1 << 20):.1f} МБ, {seconds:.2f} с')
+        print(f'Способ: {self.usedStrategy}, процессов (потоков): {self.usedWorkers}, '
+              f'задач: {len(self.log)}, общее время: {self.wallTime:.2f} с')
@@ -0,0 +1,33 @@
+from Splitter import Splitter
+from SharedPartitions import SharedPartitions
+from DynamicsCalculator import Calculator
+from DynamicsExecutor import DynamicsExecutor
+
+
+def RunDynamicsTask(strategy=None):
+    fileName = input("Введите название файла: ")
+    vacancyName = input("Введите название профессии: ")
+    areaName = input("Введите название региона (пусто - все регионы): ") or None
+    years = [int(year) for year in input("Введите годы через пробел (пусто - все годы): ").split()] or None
+    if strategy is None:
+        strategy = input("Введите способ выполнения (serial, threads, processes, auto): ") or "auto"
+    inMemory = input("Разделить файл в памяти, без записи на диск (да/нет): ") == "да"
+    if inMemory:
+        splitter = SharedPartitions(fileName, granularity="month")
+    else:
+        splitter = Splitter(fileName, "CsvFilesByMonth", "DataByMonth", granularity="month")
+    dynamicsCalculator = Calculator(vacancyName, areaName, years=years)
+    executor = DynamicsExecutor(strategy)
+    try:
+        res = executor.Run(dynamicsCalculator.GetDynamicsByYear,
+                           [(splitter.GetFileName(partition), partition)
+                            for partition in dynamicsCalculator.SelectPartitions(splitter)])
+    finally:
+        if inMemory:
+            splitter.Close()
+    executor.PrintTimings()
+    return dynamicsCalculator.HandleResults(res)
+
+
+if __name__ == "__main__":
+    RunDynamicsTask()
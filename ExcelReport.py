@@ -0,0 +1,225 @@
+import csv
+from itertools import islice, zip_longest
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, NamedStyle, Side, Border
+from openpyxl.utils import get_column_letter
+
+
+class ExcelWriter:
+    """
+    Класс потоковой записи Excel файла (режим write-only openpyxl).
+    Строки записываются на диск сразу, ширина колонок считается по мере формирования строк,
+    именованные стили регистрируются в книге один раз.
+
+    Attributes:
+        maxRowsOnSheet (int): Максимальное количество строк на одном листе Excel
+        fileName (str): Название файла
+        sampleRows (int): Количество первых строк листа, по которым считается ширина колонок
+        book (Workbook): Excel книга в режиме write-only
+    """
+    maxRowsOnSheet = 1048576
+
+    def __init__(self, fileName, sampleRows=1000):
+        """
+        Инициализирует объект ExcelWriter
+
+        Args:
+            fileName (str): Название файла
+            sampleRows (int): Количество первых строк листа, по которым считается ширина колонок
+        """
+        self.fileName = fileName
+        self.sampleRows = sampleRows
+        self.book = openpyxl.Workbook(write_only=True)
+        self.__CreateStyles()
+
+    def __CreateStyles(self):
+        """
+        Регистрирует в книге именованные стили заголовков и ячеек
+        """
+        border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'),
+                        bottom=Side(style='thin'))
+        headingsStyle = NamedStyle(name='headingsStyle', font=Font(bold=True), border=border)
+        cellStyle = NamedStyle(name='cellStyle', border=border)
+        percentStyle = NamedStyle(name='percentStyle', border=border, number_format='0.00%')
+        separatorStyle = NamedStyle(name='separatorStyle',
+                                    border=Border(left=Side(style='thin'), right=Side(style='thin')))
+        for style in (headingsStyle, cellStyle, percentStyle, separatorStyle):
+            self.book.add_named_style(style)
+
+    def AddSheet(self, title, headings, rows, columnStyles=None):
+        """
+        Записывает лист за один проход по строкам.
+        Первые sampleRows строк буферизуются для подсчета ширины колонок
+        (в режиме write-only ширина должна быть задана до записи строк), остальные пишутся сразу.
+        Если строк больше, чем помещается на лист, создаются листы "title (2)", "title (3)" и т.д.
+
+        Args:
+            title (str): Название листа
+            headings (list[str]): Заголовки колонок
+            rows (iterable): Строки данных
+            columnStyles (dict): Имена стилей для колонок (номер колонки с нуля: имя стиля)
+        """
+        columnStyles = columnStyles or {}
+        headingStyles = {i: 'separatorStyle' if columnStyles.get(i) == 'separatorStyle' else 'headingsStyle'
+                         for i in range(len(headings))}
+        rows = iter(rows)
+        sheetNumber = 1
+        while True:
+            sheetTitle = title if sheetNumber == 1 else f'{title} ({sheetNumber})'
+            sampleRows = list(islice(rows, min(self.sampleRows, self.maxRowsOnSheet - 1)))
+            if sheetNumber > 1 and not sampleRows:
+                return
+            sheet = self.book.create_sheet(sheetTitle)
+            widths = [len(str(heading)) for heading in headings]
+            for row in sampleRows:
+                self.__UpdateWidths(widths, row)
+            for i, width in enumerate(widths):
+                sheet.column_dimensions[get_column_letter(i + 1)].width = width + 2
+
+            sheet.append(self.__StyleRow(sheet, headings, headingStyles))
+            for row in sampleRows:
+                sheet.append(self.__StyleRow(sheet, row, columnStyles))
+            rowsLeft = self.maxRowsOnSheet - 1 - len(sampleRows)
+            for row in islice(rows, rowsLeft):
+                sheet.append(self.__StyleRow(sheet, row, columnStyles))
+                rowsLeft -= 1
+            if rowsLeft > 0:
+                return
+            sheetNumber += 1
+
+    def AddCsvSheet(self, title, csvFileName, numericColumns=()):
+        """
+        Построчно переносит CSV файл на лист (листы) Excel, не загружая файл в память целиком
+
+        Args:
+            title (str): Название листа
+            csvFileName (str): Название CSV файла
+            numericColumns (tuple[str]): Колонки, значения которых записываются числами
+        """
+        with open(csvFileName, encoding='utf-8-sig', newline='') as file:
+            fileReader = csv.reader(file)
+            headings = next(fileReader, [])
+            numericIndexes = [i for i, heading in enumerate(headings) if heading in numericColumns]
+            self.AddSheet(title, headings, (self.__ConvertRow(row, numericIndexes) for row in fileReader))
+
+    def Save(self):
+        """
+        Сохраняет книгу в файл
+        """
+        self.book.save(self.fileName)
+
+    @staticmethod
+    def __ConvertRow(row, numericIndexes):
+        """
+        Преобразует значения числовых колонок строки CSV в float, пустые значения - в None
+
+        Args:
+            row (list[str]): Строка CSV файла
+            numericIndexes (list[int]): Номера числовых колонок
+
+        Returns:
+            list: Строка для записи в Excel
+        """
+        for i in numericIndexes:
+            row[i] = float(row[i]) if row[i] else None
+        return row
+
+    @staticmethod
+    def __UpdateWidths(widths, row):
+        """
+        Обновляет ширину колонок по значениям строки
+
+        Args:
+            widths (list[int]): Текущая ширина колонок
+            row (list): Строка данных
+        """
+        for i, value in enumerate(row):
+            length = len(str(value)) if value is not None else 0
+            if i >= len(widths):
+                widths.append(length)
+            elif length > widths[i]:
+                widths[i] = length
+
+    @staticmethod
+    def __StyleRow(sheet, row, columnStyles):
+        """
+        Оборачивает значения строки в ячейки с именованными стилями
+
+        Args:
+            sheet (WriteOnlyWorksheet): Лист
+            row (list): Строка данных
+            columnStyles (dict): Имена стилей для колонок
+
+        Returns:
+            list[WriteOnlyCell]: Строка из ячеек
+        """
+        cells = []
+        for i, value in enumerate(row):
+            cell = WriteOnlyCell(sheet, value)
+            cell.style = columnStyles.get(i, 'cellStyle')
+            cells.append(cell)
+        return cells
+
+
+def GetStatisticsByYearRows(listData):
+    """
+    Формирует строки таблицы статистики по годам
+
+    Args:
+        listData (list[dict]): Данные файла
+
+    Returns:
+        list[list]: Строки вида [год, 4 динамики]
+    """
+    return [[year] + [dictData.get(year) for dictData in listData[0:4]] for year in listData[0].keys()]
+
+
+def GetStatisticsByCityRows(listData, count=10):
+    """
+    Формирует строки таблицы статистики по городам: уровень зарплат и доля вакансий через пустую колонку
+
+    Args:
+        listData (list[dict]): Данные файла
+        count (int): Количество городов
+
+    Returns:
+        list[list]: Строки вида [город, зарплата, "", город, доля]
+    """
+    salaries = list(listData[4].items())[:count]
+    ratios = list(listData[5].items())[:count]
+    return [[*salary, None, *ratio] for salary, ratio in zip_longest(salaries, ratios, fillvalue=(None, None))]
+
+
+def GenerateStatisticsExcel(fileName, listData, vacancyName):
+    """
+    Формирует Excel файл, в котором представлены динамики данных из файла в виде таблиц
+
+    Args:
+        fileName (str): Название файла
+        listData (list[dict]): Данные файла
+        vacancyName (str): Название профессии
+    """
+    headingsByYear = ["Год", "Средняя зарплата", f'Средняя зарплата - {vacancyName}', "Количество вакансий",
+                      f'Количество вакансий - {vacancyName}']
+    headingsByCity = ["Город", "Уровень зарплат", "", "Город", "Доля вакансий"]
+    writer = ExcelWriter(fileName)
+    writer.AddSheet("Статистика по годам", headingsByYear, GetStatisticsByYearRows(listData))
+    writer.AddSheet("Статистика по городам", headingsByCity, GetStatisticsByCityRows(listData),
+                    {2: 'separatorStyle', 4: 'percentStyle'})
+    writer.Save()
+
+
+def GenerateVacanciesExcel(fileName, csvFileName, sampleRows=1000):
+    """
+    Формирует Excel файл с исходной таблицей вакансий.
+    Память ограничена sampleRows строками независимо от размера CSV файла
+
+    Args:
+        fileName (str): Название Excel файла
+        csvFileName (str): Название CSV файла с вакансиями
+        sampleRows (int): Количество первых строк, по которым считается ширина колонок
+    """
+    writer = ExcelWriter(fileName, sampleRows)
+    writer.AddCsvSheet("Вакансии", csvFileName, ("salary_from", "salary_to", "salary"))
+    writer.Save()
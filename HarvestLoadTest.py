@@ -0,0 +1,71 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+from MockHHServer import MockHHServer, GenerateVacancies
+from distributorVacancies import DistributorVacancies
+from VacancySink import VacancySink
+
+
+def RunHarvest(vacancies, day, windows, concurrency, requestsPerSecond, latency, errorRate, rateLimit, maxResults):
+    # Один сбор дня через HarvestToSink (как GetVacanciesCSV) против локального сервера
+    path = tempfile.mkdtemp()
+    try:
+        with MockHHServer(vacancies, latency=latency, errorRate=errorRate, rateLimit=rateLimit,
+                          maxResults=maxResults) as server:
+            distributor = DistributorVacancies(concurrency=concurrency, url=server.url,
+                                               requestsPerSecond=requestsPerSecond, baseDelay=0.1, maxDelay=5)
+            distributor.maxResults = maxResults
+            timeRanges = [distributor.GetTimeRange(day + pd.Timedelta(hours=24 / windows * i), 24 / windows)
+                          for i in range(windows)]
+            start = time.perf_counter()
+            with VacancySink(os.path.join(path, "vacancies.csv")) as sink, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                distributor.HarvestToSink(timeRanges, sink)
+            wallTime = time.perf_counter() - start
+            written = sink.written
+            serverRequests = server.GetRequestsCount()
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+    summary = distributor.statistics.GetSummary()
+    summary.update({"wallTime": wallTime, "serverRequests": serverRequests,
+                    "requestsPerSecond": serverRequests / wallTime, "written": written,
+                    "completeness": written / len(vacancies), "breakerOpens": distributor.circuitBreaker.opensCount})
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочный тест DistributorVacancies против локального сервера HH")
+    parser.add_argument("--vacancies", type=int, default=20000, help="Вакансий за день")
+    parser.add_argument("--windows", type=int, default=4, help="Окон на день, как deltaTimeRange в GetVacanciesCSV")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--requestsPerSecond", type=float, default=50, help="Лимит клиента")
+    parser.add_argument("--latency", type=float, default=0.05, help="Задержка ответа сервера, с")
+    parser.add_argument("--errorRate", type=float, nargs="+", default=[0, 0.05], help="Доли ответов 503")
+    parser.add_argument("--rateLimit", type=int, default=None, help="Лимит сервера в секунду, сверх него - 429")
+    parser.add_argument("--maxResults", type=int, default=2000, help="Ограничение выдачи сервера")
+    parser.add_argument("--output", help="Файл результатов в JSON")
+    args = parser.parse_args()
+
+    day = pd.Timestamp("2022-12-02")
+    vacancies = GenerateVacancies(day, args.vacancies)
+    results = []
+    for errorRate in args.errorRate:
+        for concurrency in args.concurrency:
+            result = RunHarvest(vacancies, day, args.windows, concurrency, args.requestsPerSecond, args.latency,
+                                errorRate, args.rateLimit, args.maxResults)
+            result.update({"concurrency": concurrency, "errorRate": errorRate})
+            results.append(result)
+            print(f'503 {errorRate:4.0%}, потоков {concurrency:>3}: {result["wallTime"]:6.2f} с, '
+                  f'{result["requestsPerSecond"]:6.1f} запросов/с, полнота {result["completeness"]:6.1%}, '
+                  f'запросов {result["serverRequests"]}, повторов {result["retries"]}, 429: {result["throttled"]}, '
+                  f'503: {result["errors"]}, размыканий {result["breakerOpens"]}, '
+                  f'p50/p99 {result["p50"] * 1000:.0f}/{result["p99"] * 1000:.0f} мс')
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"arguments": vars(args), "runs": results}, file, ensure_ascii=False, indent=2)
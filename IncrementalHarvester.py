@@ -0,0 +1,149 @@
+import io
+import json
+import os
+import time
+import pandas as pd
+from currenciesParser import ConversionRates, convertedCurrencies
+from VacancySink import VacancySink
+
+
+class IncrementalHarvester:
+    # Постоянный сбор новых вакансий: раз в interval секунд запрашивается только интервал после
+    # высшей отметки published_at (с запасом overlap на задержку индексации HH, повторы отбрасывает VacancySink).
+    # Новые строки сырого файла пересчитываются в рубли, дописываются в convertedFileName и добавляются
+    # в суммы по месяцам и городам, история повторно не обрабатывается.
+    # Отметка, обработанные части сырого и сконвертированного файлов и суммы хранятся в stateFileName
+    # и заменяются атомарно, поэтому после сбоя сконвертированный файл обрезается до сохраненного размера.
+    # Файлы по умолчанию свои: разовый сбор (GetVacanciesCSV) и CurrenciesParser переписывают свои файлы заново.
+    # Все даты - в поясе HH (distributor.timeZone), независимо от пояса машины
+    convertedColumns = ["name", "salary", "area_name", "published_at"]
+
+    def __init__(self, distributor, fileName="IncrementalVacancies.csv",
+                 convertedFileName="IncrementalConvertedVacancies.csv", stateFileName="IncrementalHarvester.json",
+                 interval=300, overlap=pd.Timedelta(minutes=30), startDate=None, conversionRates=None):
+        self.distributor = distributor
+        self.fileName = fileName
+        self.convertedFileName = convertedFileName
+        self.stateFileName = stateFileName
+        self.interval = interval
+        self.overlap = overlap
+        self.conversionRates = conversionRates if conversionRates is not None else ConversionRates()
+        self.startDate = startDate
+        self.LoadState()
+
+    def RunOnce(self, now=None):
+        now = self.distributor.GetNow().floor("s") if now is None else pd.Timestamp(now)
+        firstDate = pd.Timestamp(self.state["highWater"]).floor("s") - self.overlap
+        with VacancySink(self.fileName) as sink:
+            self.distributor.HarvestToSink([(firstDate, now)], sink)
+        self.CheckConvertedFile()
+        newVacancies = self.ReadNewVacancies()
+        converted = self.ConvertVacancies(newVacancies)
+        self.AppendConverted(converted)
+        self.AddToSummary(converted)
+        if len(newVacancies):
+            published = pd.to_datetime(newVacancies["published_at"], format="%Y-%m-%dT%H:%M:%S%z", utc=True)
+            lastPublished = published.max().tz_convert(self.distributor.timeZone).tz_localize(None)
+            self.state["highWater"] = max(pd.Timestamp(self.state["highWater"]), lastPublished).isoformat()
+        self.SaveState()
+        return len(newVacancies), len(converted)
+
+    def Run(self, iterations=None):
+        # Ошибка одного опроса (HH или ЦБ недоступны) сбор не останавливает: изменения состояния в памяти
+        # отбрасываются, следующий опрос продолжает с последнего сохраненного состояния
+        iteration = 0
+        while iterations is None or iteration < iterations:
+            start = time.monotonic()
+            try:
+                newCount, convertedCount = self.RunOnce()
+                print(f'{self.distributor.GetNow():%Y-%m-%d %H:%M:%S}: новых вакансий {newCount}, '
+                      f'с зарплатой {convertedCount}, отметка {self.state["highWater"]}')
+            except Exception as error:
+                print(f'{self.distributor.GetNow():%Y-%m-%d %H:%M:%S}: опрос не выполнен: {error!r}')
+                self.LoadState()
+            iteration += 1
+            if iterations is None or iteration < iterations:
+                time.sleep(max(0, self.interval - (time.monotonic() - start)))
+
+    def LoadState(self):
+        self.state = {"highWater": None, "rawOffset": 0, "convertedOffset": 0, "byMonth": {}, "byCity": {}}
+        if os.path.exists(self.stateFileName):
+            with open(self.stateFileName, encoding="utf-8") as file:
+                self.state = json.load(file)
+        if self.state["highWater"] is None:
+            self.state["highWater"] = (pd.Timestamp(self.startDate) if self.startDate is not None
+                                       else self.distributor.GetNow().normalize()).isoformat()
+
+    def CheckConvertedFile(self):
+        # Сконвертированный файл удален или короче сохраненного размера: обрезка дополнила бы его нулями,
+        # поэтому он и суммы строятся заново по всему сырому файлу, отметка не меняется
+        size = os.path.getsize(self.convertedFileName) if os.path.exists(self.convertedFileName) else -1
+        if size < self.state["convertedOffset"]:
+            print(f'{self.convertedFileName}: {max(size, 0)} байт вместо {self.state["convertedOffset"]}, '
+                  f'файл пересчитывается заново')
+            if size >= 0:
+                os.remove(self.convertedFileName)
+            self.state.update(rawOffset=0, convertedOffset=0, byMonth={}, byCity={})
+
+    def ReadNewVacancies(self):
+        # Строки сырого файла, дописанные после последней обработки
+        with open(self.fileName, "rb") as file:
+            file.seek(self.state["rawOffset"])
+            content = file.read()
+        if not content:
+            return pd.DataFrame(columns=VacancySink.columns)
+        dtype = {"id": str, "name": str, "salary_currency": str, "area_name": str, "published_at": str}
+        if self.fileName.endswith(".jsonl"):
+            df = pd.read_json(io.BytesIO(content), lines=True, dtype=dtype)
+        elif self.state["rawOffset"] == 0:
+            df = pd.read_csv(io.BytesIO(content), dtype=dtype)
+        else:
+            df = pd.read_csv(io.BytesIO(content), header=None, names=VacancySink.columns, dtype=dtype)
+        self.state["rawOffset"] += len(content)
+        return df
+
+    def ConvertVacancies(self, df):
+        # Как CurrenciesParser.ConvertToRub: среднее вилки по курсу ЦБ на первое число месяца публикации,
+        # только валюты convertedCurrencies. Порог CurrenciesParser.ApplyPreselection (больше 5000 вакансий
+        # в валюте по всему файлу) по новым частям файла не посчитать, поэтому валюта из списка
+        # пересчитывается и тогда, когда разовый пересчет того же файла отбросил бы ее как редкую
+        df = df.copy()
+        df["salary"] = df[["salary_from", "salary_to"]].astype("float64").mean(axis=1)
+        months = df["published_at"].str[:7]
+        rates = {(month, currency): 1 if currency == "RUR" else self.conversionRates.GetMonthRates(month).get(currency)
+                 for month, currency in set(zip(months, df["salary_currency"])) if currency in convertedCurrencies}
+        df["salary"] *= [rates.get((month, currency)) for month, currency in zip(months, df["salary_currency"])]
+        df = df[df["salary"].notnull()]
+        df["published_at"] = df["published_at"].str[:19]
+        return df.loc[:, self.convertedColumns]
+
+    def AppendConverted(self, df):
+        # Хвост, дописанный после последнего сохранения состояния, отбрасывается
+        with open(self.convertedFileName, "ab") as file:
+            file.truncate(self.state["convertedOffset"])
+            file.write(df.to_csv(index=False, header=self.state["convertedOffset"] == 0).encode("utf-8"))
+            file.flush()
+            os.fsync(file.fileno())
+            self.state["convertedOffset"] = file.tell()
+
+    def AddToSummary(self, df):
+        # Суммы и количества вакансий с зарплатой по месяцам и городам
+        for key, groups in (("byMonth", df.groupby(df["published_at"].str[:7])["salary"]),
+                            ("byCity", df.groupby("area_name")["salary"])):
+            sums = groups.agg(["sum", "count"])
+            for name, salarySum, count in zip(sums.index, sums["sum"], sums["count"]):
+                oldSum, oldCount = self.state[key].get(name, (0, 0))
+                self.state[key][name] = (oldSum + float(salarySum), oldCount + int(count))
+
+    def GetSummary(self):
+        byMonth = {month: int(salarySum / count) for month, (salarySum, count) in sorted(self.state["byMonth"].items())}
+        byCity = {area: int(salarySum / count) for area, (salarySum, count) in sorted(
+            self.state["byCity"].items(), key=lambda item: item[1][0] / item[1][1], reverse=True)}
+        return byMonth, byCity
+
+    def SaveState(self):
+        with open(f'{self.stateFileName}.tmp', "w", encoding="utf-8") as file:
+            json.dump(self.state, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(f'{self.stateFileName}.tmp', self.stateFileName)
@@ -0,0 +1,162 @@
+import argparse
+import collections
+import json
+import math
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import pandas as pd
+
+
+def GenerateVacancies(date, count, seed=0):
+    # Вакансии одного дня в формате API HH: больше всего публикаций днем, примерно у половины есть зарплата
+    randomizer = random.Random(seed)
+    date = pd.Timestamp(date).normalize()
+    names = ["Программист Python", "Java разработчик", "Аналитик данных", "Системный аналитик",
+             "Менеджер по продажам", "Бухгалтер", "Водитель", "Тестировщик"]
+    areas = ["Москва", "Санкт-Петербург", "Новосибирск", "Екатеринбург", "Казань", "Алматы", "Минск"]
+    currencies = ["RUR"] * 20 + ["KZT", "USD", "EUR", "BYR"]
+    vacancies = []
+    for i in range(count):
+        seconds = int(min(max(randomizer.gauss(13 * 3600, 4 * 3600), 0), 24 * 3600 - 1))
+        salaryFrom = randomizer.randint(20, 300) * 1000
+        area = randomizer.choice(areas)
+        salary = {"from": salaryFrom if randomizer.random() < 0.8 else None,
+                  "to": salaryFrom + randomizer.randint(0, 100) * 1000 if randomizer.random() < 0.6 else None,
+                  "currency": randomizer.choice(currencies), "gross": randomizer.random() < 0.5}
+        vacancies.append({"id": str(50000000 + i), "name": randomizer.choice(names),
+                          "salary": salary if randomizer.random() < 0.55 else None,
+                          "area": {"id": str(areas.index(area) + 1), "name": area},
+                          "published_at": (date + pd.Timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%S+0300")})
+    # Как в HH, сначала новые
+    vacancies.sort(key=lambda vacancy: (vacancy["published_at"], vacancy["id"]), reverse=True)
+    return vacancies
+
+
+class MockHHRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Заголовки и тело уходят отдельными записями; без TCP_NODELAY алгоритм Нейгла и отложенное
+        # подтверждение добавляют к каждому ответу keep-alive соединения десятки миллисекунд
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        mock = self.server.mock
+        url = urlparse(self.path)
+        parameters = {key: values[0] for key, values in parse_qs(url.query).items()}
+        mock.CountRequest(url.query)
+        time.sleep(mock.latency)
+        if url.path != "/vacancies":
+            return self.SendJson(404, {"errors": [{"type": "not_found"}]})
+        if mock.IsThrottled():
+            return self.SendJson(429, {"errors": [{"type": "too_many_requests"}]}, {"Retry-After": "1"})
+        if mock.randomizer.random() < mock.errorRate:
+            return self.SendJson(503, {"errors": [{"type": "service_unavailable"}]})
+        if (int(parameters.get("page", 0)) + 1) * int(parameters.get("per_page", 20)) > mock.maxResults:
+            # Как HH: глубже первых maxResults результатов выдача не отдается
+            return self.SendJson(400, {"errors": [{"type": "bad_argument", "value": "page"}]})
+        self.SendJson(200, mock.GetPage(parameters))
+
+    def SendJson(self, status, data, headers=None):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockHHServer:
+    # Локальная замена https://api.hh.ru/vacancies: date_from, date_to, per_page, page.
+    # Отдается не больше maxResults первых результатов запроса (у HH - 2000), errorRate - доля ответов 503,
+    # rateLimit - запросов в секунду, сверх которых отвечает 429 с Retry-After.
+    # inclusiveDateTo - date_to включается в выдачу (для HH это не проверено, по умолчанию граница исключается).
+    # Запуск в отдельном потоке: with MockHHServer(vacancies) as server: ... server.url
+    def __init__(self, vacancies, latency=0.05, errorRate=0, rateLimit=None, maxResults=2000, host="127.0.0.1",
+                 port=0, seed=0, inclusiveDateTo=False):
+        self.vacancies = vacancies
+        self.inclusiveDateTo = inclusiveDateTo
+        self.maxResults = maxResults
+        self.latency = latency
+        self.errorRate = errorRate
+        self.rateLimit = rateLimit
+        self.randomizer = random.Random(seed)
+        self.recentRequests = collections.deque()
+        self.requests = {}
+        self.lock = threading.Lock()
+        self.httpServer = ThreadingHTTPServer((host, port), MockHHRequestHandler)
+        self.httpServer.daemon_threads = True
+        self.httpServer.mock = self
+        self.url = f'http://{host}:{self.httpServer.server_address[1]}/vacancies'
+        self.thread = None
+
+    def CountRequest(self, query):
+        with self.lock:
+            self.requests[query] = self.requests.get(query, 0) + 1
+
+    def IsThrottled(self):
+        # Скользящее окно в одну секунду
+        if self.rateLimit is None:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            while self.recentRequests and self.recentRequests[0] <= now - 1:
+                self.recentRequests.popleft()
+            if len(self.recentRequests) >= self.rateLimit:
+                return True
+            self.recentRequests.append(now)
+            return False
+
+    def GetRequestsCount(self):
+        with self.lock:
+            return sum(self.requests.values())
+
+    def GetPage(self, parameters):
+        dateFrom, dateTo = parameters.get("date_from", ""), parameters.get("date_to", "9999")
+        perPage, page = int(parameters.get("per_page", 20)), int(parameters.get("page", 0))
+        found = [vacancy for vacancy in self.vacancies if dateFrom <= vacancy["published_at"][:19] < dateTo
+                 or self.inclusiveDateTo and vacancy["published_at"][:19] == dateTo]
+        return {"items": found[page * perPage:(page + 1) * perPage], "found": len(found),
+                "pages": min(math.ceil(len(found) / perPage), self.maxResults // perPage), "page": page,
+                "per_page": perPage}
+
+    def Start(self):
+        self.thread = threading.Thread(target=self.httpServer.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def Stop(self):
+        self.httpServer.shutdown()
+        self.httpServer.server_close()
+
+    def __enter__(self):
+        return self.Start()
+
+    def __exit__(self, excType, excValue, traceback):
+        self.Stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Локальный сервер /vacancies в формате API HH")
+    parser.add_argument("--vacancies", type=int, default=5000, help="Вакансий за сегодняшний день")
+    parser.add_argument("--latency", type=float, default=0.05, help="Задержка ответа, с")
+    parser.add_argument("--errorRate", type=float, default=0, help="Доля ответов 503")
+    parser.add_argument("--rateLimit", type=int, default=None, help="Запросов в секунду, сверх них - 429")
+    parser.add_argument("--maxResults", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    with MockHHServer(GenerateVacancies(pd.Timestamp.now(), args.vacancies), latency=args.latency,
+                      errorRate=args.errorRate, rateLimit=args.rateLimit, maxResults=args.maxResults,
+                      port=args.port) as server:
+        print(f'Сервер запущен: {server.url}')
+        server.thread.join()
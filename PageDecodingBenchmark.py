@@ -0,0 +1,72 @@
+import argparse
+import json
+import time
+import pandas as pd
+from MockHHServer import GenerateVacancies
+from distributorVacancies import DistributorVacancies, LoadJson
+
+
+def GetFullItem(vacancy, i):
+    # Вакансия в полном формате выдачи HH: работодатель, описание, адрес, график и т.д.
+    return dict(vacancy, **{
+        "premium": False, "has_test": False, "response_letter_required": False, "type": {"id": "open",
+                                                                                          "name": "Открытая"},
+        "address": {"city": vacancy["area"]["name"], "street": "улица Ленина", "building": str(i % 200),
+                    "lat": 55.75 + i % 100 / 1000, "lng": 37.61, "metro_stations": [
+                        {"station_name": "Охотный ряд", "line_name": "Сокольническая", "lat": 55.757,
+                         "lng": 37.615}]},
+        "response_url": None, "sort_point_distance": None, "archived": False,
+        "created_at": vacancy["published_at"], "apply_alternate_url": f'https://hh.ru/applicant/{i}',
+        "url": f'https://api.hh.ru/vacancies/{vacancy["id"]}', "alternate_url": f'https://hh.ru/vacancy/{vacancy["id"]}',
+        "employer": {"id": str(1000 + i % 500), "name": f'ООО Работодатель {i % 500}', "trusted": True,
+                     "url": f'https://api.hh.ru/employers/{1000 + i % 500}',
+                     "alternate_url": f'https://hh.ru/employer/{1000 + i % 500}',
+                     "logo_urls": {size: f'https://hhcdn.ru/employer-logo/{i}_{size}.png'
+                                   for size in ("90", "240", "original")}},
+        "snippet": {"requirement": "Опыт коммерческой разработки от 3 лет. Знание SQL, Git, Docker. " * 2,
+                    "responsibility": "Разработка и поддержка сервисов, участие в код-ревью, "
+                                      "взаимодействие с аналитиками и тестировщиками. " * 2},
+        "schedule": {"id": "fullDay", "name": "Полный день"}, "working_days": [], "working_time_intervals": [],
+        "working_time_modes": [], "accept_temporary": False, "professional_roles": [{"id": "96",
+                                                                                     "name": "Программист"}],
+        "experience": {"id": "between3And6", "name": "От 3 до 6 лет"},
+        "employment": {"id": "full", "name": "Полная занятость"}})
+
+
+def DecodeWithDicts(distributor, content):
+    # Путь до изменений: response.json() (декодирование в str и стандартный json) и словарь на каждую вакансию
+    return distributor.GetVacanciesFromPage(json.loads(content.decode("utf-8")))
+
+
+def DecodeWithColumns(distributor, content):
+    return distributor.GetColumnsFromPage(LoadJson(content))
+
+
+def MeasureCpuTime(decode, distributor, pages, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.process_time()
+        for content in pages:
+            decode(distributor, content)
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(pages)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Время процессора на разбор страницы выдачи HH из 100 вакансий")
+    parser.add_argument("--pages", type=int, default=200, help="Количество страниц")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество повторов, берется лучший")
+    args = parser.parse_args()
+
+    vacancies = GenerateVacancies(pd.Timestamp("2022-12-02"), args.pages * 100)
+    pages = [json.dumps({"items": [GetFullItem(vacancy, start + i) for i, vacancy in
+                                   enumerate(vacancies[start:start + 100])],
+                         "found": len(vacancies), "pages": args.pages, "page": start // 100, "per_page": 100},
+                        ensure_ascii=False).encode("utf-8") for start in range(0, len(vacancies), 100)]
+    distributor = DistributorVacancies()
+    print(f'Страница: {sum(map(len, pages)) / len(pages) / 1024:.0f} КБ, парсер: {LoadJson.__module__}')
+    oldTime = MeasureCpuTime(DecodeWithDicts, distributor, pages, args.repeat)
+    newTime = MeasureCpuTime(DecodeWithColumns, distributor, pages, args.repeat)
+    print(f'json + словари: {oldTime * 1000:.2f} мс на страницу')
+    print(f'{LoadJson.__module__} + колонки: {newTime * 1000:.2f} мс на страницу ({oldTime / newTime:.1f}x)')
@@ -3,7 +3,11 @@ from statistics import mean
 import math
 
 pd.set_option("expand_frame_repr", False)
-df = pd.read_csv("vacancies_dif_currencies.csv")
+# Все колонки вакансии попадают в processed_vacancies.csv; границы вилки - float32, валюта и город - категории
+df = pd.read_csv("vacancies_dif_currencies.csv",
+                 usecols=["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"],
+                 dtype={"salary_from": "float32", "salary_to": "float32", "salary_currency": "category",
+                        "area_name": "category"})
 df_dates = pd.read_csv("cb_currencies.csv")
 
 
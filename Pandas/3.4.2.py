@@ -9,6 +9,10 @@ from jinja2 import Environment, FileSystemLoader
 import pdfkit
 
 pd.set_option("expand_frame_repr", False)
+# Колонки файла вакансий и их типы: границы вилки - float32, повторяющиеся валюта и город - категории
+vacancies_columns = ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]
+vacancies_dtypes = {"salary_from": "float32", "salary_to": "float32", "salary_currency": "category",
+                    "area_name": "category"}
 
 
 """
@@ -39,7 +43,9 @@ def handle_salary(dates, date, salary_from, salary_to, salary_currency):
 """
 def get_year_statistics(file_name, job_name, dates):
     year = file_name[-8:-4]
-    df = pd.read_csv(file_name)
+    # Город для статистики по годам не нужен
+    df = pd.read_csv(file_name, usecols=["name", "salary_from", "salary_to", "salary_currency", "published_at"],
+                     dtype=vacancies_dtypes)
     df["salary"] = df.apply(lambda row:
                             handle_salary(dates,
                                           row["published_at"][:7].split("-"),
@@ -60,7 +66,7 @@ def get_year_statistics(file_name, job_name, dates):
 Метод для разделения исходного файла на более мелкие по годам
 """
 def separate_csv(file_name):
-    df = pd.read_csv(file_name)
+    df = pd.read_csv(file_name, usecols=vacancies_columns, dtype=vacancies_dtypes)
     df["years"] = df["published_at"].apply(lambda s: s[0:4])
     years = df["years"].unique()
 
@@ -170,18 +176,19 @@ class Report:
     """
     def generate_pdf(self):
         env = Environment(loader=FileSystemLoader("."))
-        template = env.get_template("pdf_template.html")
+        template = env.get_template("pdfTemplate.html")
 
         years_headers = ["Год", "Средняя зарплата", f"Средняя зарплата - {self.job_name}", "Количество вакансий",
                        f"Количество вакансий - {self.job_name}"]
 
         pdf_template = template.render(
-            {"job_name": self.job_name,
-             "years_salaries": self.years_salaries,
-             "years_vacancies_counts": self.years_vacancies_counts,
-             "job_years_salaries": self.job_years_salaries,
-             "job_years_vacancies": self.job_years_vacancies,
-             "years_headers": years_headers})
+            {"fileName": os.path.abspath("graph.png"),
+             "vacancyName": self.job_name,
+             "headingsByYear": years_headers,
+             "dynamicsSalaries": self.years_salaries,
+             "dynamicsSalariesAtVacancy": self.job_years_salaries,
+             "dynamicsCountVacancies": self.years_vacancies_counts,
+             "dynamicsCountVacanciesAtVacancy": self.job_years_vacancies})
         config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
         pdfkit.from_string(pdf_template, 'report.pdf', configuration=config, options={"enable-local-file-access": None})
 
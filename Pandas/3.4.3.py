@@ -10,6 +10,10 @@ import pdfkit
 import re
 
 pd.set_option("expand_frame_repr", False)
+# Колонки файла вакансий и их типы: границы вилки - float32, повторяющиеся валюта и город - категории
+vacancies_columns = ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]
+vacancies_dtypes = {"salary_from": "float32", "salary_to": "float32", "salary_currency": "category",
+                    "area_name": "category"}
 
 
 """
@@ -40,7 +44,9 @@ def handle_salary(dates_currencies, date, salary_from, salary_to, salary_currenc
 """
 def get_year_statistics(file_name, job_name, dates):
     year = file_name[-8:-4]
-    df = pd.read_csv(file_name)
+    # Город для статистики по годам не нужен
+    df = pd.read_csv(file_name, usecols=["name", "salary_from", "salary_to", "salary_currency", "published_at"],
+                     dtype=vacancies_dtypes)
     df["salary"] = df.apply(lambda row:
                             handle_salary(dates,
                                           row["published_at"][:7].split("-"),
@@ -61,7 +67,7 @@ def get_year_statistics(file_name, job_name, dates):
 Метод для разделения исходного файла на более мелкие по годам
 """
 def separate_csv(file_name):
-    df = pd.read_csv(file_name)
+    df = pd.read_csv(file_name, usecols=vacancies_columns, dtype=vacancies_dtypes)
     df["years"] = df["published_at"].apply(lambda s: s[0:4])
     years = df["years"].unique()
 
@@ -75,7 +81,7 @@ def separate_csv(file_name):
 Метод для однопроцессной обработки данных о зарплатах по городам
 """
 def get_singleprocess_statistics(file_name, job_name, area_name, dates_currencies):
-    df = pd.read_csv(file_name)
+    df = pd.read_csv(file_name, usecols=vacancies_columns, dtype=vacancies_dtypes)
     df["year"] = df.apply(lambda row: row["published_at"][0:4], axis=1)
     years = df["year"].unique()
     df["salary"] = df.apply(lambda row:
@@ -276,19 +282,19 @@ class Report:
     """
     def generate_pdf(self):
         env = Environment(loader=FileSystemLoader("."))
-        template = env.get_template("pdf_template.html")
+        template = env.get_template("pdfTemplate.html")
 
         years_headers = ["Год",
                          f"Средняя зарплата - {self.job_name}, регион - {self.area_name}",
                          f"Количество вакансий - {self.job_name}, регион - {self.area_name}"]
 
         pdf_template = template.render(
-            {"job_name": self.job_name,
-             "job_years_salaries": self.job_years_salaries,
-             "job_years_vacancies": self.job_years_vacancies,
-             "years_job_city_salaries": self.years_job_city_salaries,
-             "years_job_city_vacancies_count": self.years_job_city_vacancies_count,
-             "years_headers": years_headers})
+            {"fileName": os.path.abspath("graph.png"),
+             "vacancyName": self.job_name,
+             "areaName": self.area_name,
+             "headingsByYear": years_headers,
+             "dynamicsSalaries": self.years_job_city_salaries,
+             "dynamicsCountVacancies": self.years_job_city_vacancies_count})
         config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
         pdfkit.from_string(pdf_template, 'report.pdf', configuration=config, options={"enable-local-file-access": None})
 
@@ -2,11 +2,11 @@ import pdfkit
 import sys
 import csv
 import os
-import openpyxl
 import numpy as np
-import matplotlib.pyplot as plt
-from openpyxl.styles import Font, NamedStyle, Side, Border
 from jinja2 import Environment, FileSystemLoader
+from ReportChart import ChartRenderer
+from ArtifactPipeline import ArtifactPipeline
+from ExcelReport import GenerateStatisticsExcel, GenerateVacanciesExcel
 
 
 class Vacancy:
@@ -274,6 +274,199 @@ class DataSet:
         return tempAreas
 
 
+class ColumnarDataSet:
+    """
+    Класс, хранящий вакансии из CSV-файла в виде колонок numpy (для расчета статистики).
+    Средняя зарплата в рублях считается один раз при чтении файла,
+    названия городов и валют хранятся в виде кодов словаря,
+    все динамики считаются групповыми операциями над массивами.
+
+    Attributes:
+        fileName (str): Название файла
+        vacancyNameParameter (str): Название выбранной профессии
+        years (np.ndarray[int16]): Годы публикации вакансий
+        salaries (np.ndarray[float64]): Средние зарплаты в рублях
+        areaCodes (np.ndarray[int32]): Коды городов
+        currencyCodes (np.ndarray[int8]): Коды валют
+        areaNames (list[str]): Словарь городов (код - индекс в списке)
+        currencyNames (list[str]): Словарь валют (код - индекс в списке)
+        vacancyMask (np.ndarray[bool]): Вакансии выбранной профессии
+    """
+
+    def __init__(self, fileName, vacancyNameParameter):
+        """
+        Инициализирует объект ColumnarDataSet
+
+        Args:
+            fileName (str): Название файла
+            vacancyNameParameter (str): Название выбранной профессии
+        """
+        self.fileName = fileName
+        self.vacancyNameParameter = vacancyNameParameter
+        self.__UniversalParserCSV(fileName)
+
+    def __UniversalParserCSV(self, fileName):
+        """
+        Парсит CSV файл по вакансиям в колонки
+
+        Args:
+            fileName (str): Название файла
+        """
+        if os.stat(fileName).st_size == 0:
+            print("Пустой файл")
+            sys.exit()
+        areaIndexes, currencyIndexes = {}, {}
+        salariesFrom, salariesTo, years, areaCodes, currencyCodes, vacancyMask = [], [], [], [], [], []
+        with open(fileName, encoding='utf-8-sig', newline='') as file:
+            fileReader = csv.reader(file)
+            columnNames = next(fileReader)
+            columnsCount = len(columnNames)
+            indexes = {name: i for i, name in enumerate(columnNames)}
+            nameIndex, fromIndex, toIndex = indexes["name"], indexes["salary_from"], indexes["salary_to"]
+            currencyIndex, areaIndex, dateIndex = indexes["salary_currency"], indexes["area_name"], indexes["published_at"]
+            for row in fileReader:
+                if columnsCount != len(row) or not all(row):
+                    continue
+                salariesFrom.append(row[fromIndex])
+                salariesTo.append(row[toIndex])
+                years.append(row[dateIndex][0:4])
+                areaCodes.append(areaIndexes.setdefault(row[areaIndex], len(areaIndexes)))
+                currencyCodes.append(currencyIndexes.setdefault(row[currencyIndex], len(currencyIndexes)))
+                vacancyMask.append(self.vacancyNameParameter in row[nameIndex])
+
+        self.areaNames, self.currencyNames = list(areaIndexes), list(currencyIndexes)
+        rates = np.array([Salary.currencyToRub[currency] for currency in self.currencyNames], dtype=np.float64)
+        self.years = np.array(years, dtype=np.int16)
+        self.areaCodes = np.array(areaCodes, dtype=np.int32)
+        self.currencyCodes = np.array(currencyCodes, dtype=np.int8)
+        self.vacancyMask = np.array(vacancyMask, dtype=bool)
+        salariesFrom = np.trunc(np.array(salariesFrom, dtype=np.float64))
+        salariesTo = np.trunc(np.array(salariesTo, dtype=np.float64))
+        self.salaries = (salariesFrom + salariesTo) / 2 * rates[self.currencyCodes]
+
+    @staticmethod
+    def __GroupByYear(years):
+        """
+        Группирует вакансии по годам в порядке первого появления года в файле
+
+        Args:
+            years (np.ndarray[int16]): Годы публикации вакансий
+
+        Returns:
+            tuple: Список годов и номер группы каждой вакансии
+        """
+        uniqueYears, firstIndexes, groups = np.unique(years, return_index=True, return_inverse=True)
+        order = np.argsort(firstIndexes, kind="stable")
+        ranks = np.empty_like(order)
+        ranks[order] = np.arange(len(order))
+        return [int(year) for year in uniqueYears[order]], ranks[groups]
+
+    def __SalariesByYear(self, mask=None):
+        """
+        Считает среднюю зарплату по годам
+
+        Args:
+            mask (np.ndarray[bool]): Фильтр вакансий
+
+        Returns:
+            dict: Динамика уровня зарплат по годам
+        """
+        years, salaries = (self.years, self.salaries) if mask is None else (self.years[mask], self.salaries[mask])
+        keys, groups = self.__GroupByYear(years)
+        sums = np.bincount(groups, weights=salaries, minlength=len(keys))
+        counts = np.bincount(groups, minlength=len(keys))
+        return {year: int(sums[i] / counts[i]) for i, year in enumerate(keys)}
+
+    def __CountByYear(self, mask=None):
+        """
+        Считает количество вакансий по годам
+
+        Args:
+            mask (np.ndarray[bool]): Фильтр вакансий
+
+        Returns:
+            dict: Динамика количества вакансий по годам
+        """
+        keys, groups = self.__GroupByYear(self.years if mask is None else self.years[mask])
+        counts = np.bincount(groups, minlength=len(keys))
+        return {year: int(counts[i]) for i, year in enumerate(keys)}
+
+    def __AreaTotals(self):
+        """
+        Считает сумму зарплат и количество вакансий по городам,
+        оставляет только города, в которых не меньше 1% от общего числа вакансий
+
+        Returns:
+            tuple: Коды городов, суммы зарплат и количество вакансий по этим городам
+        """
+        sums = np.bincount(self.areaCodes, weights=self.salaries, minlength=len(self.areaNames))
+        counts = np.bincount(self.areaCodes, minlength=len(self.areaNames))
+        codes = np.flatnonzero(counts / len(self.areaCodes) >= 0.01)
+        return codes, sums[codes], counts[codes]
+
+    def DynamicsSalaries(self):
+        """
+        Возвращает динамику уровня зарплат по годам
+
+        Returns:
+            dict: Динамика уровня зарплат по годам
+        """
+        return self.__SalariesByYear()
+
+    def DynamicsCountVacancies(self):
+        """
+        Возвращает динамику количества вакансий по годам
+
+        Returns:
+            dict: Динамика количества вакансий по годам
+        """
+        return self.__CountByYear()
+
+    def DynamicsSalariesAtVacancy(self):
+        """
+        Возвращает динамику уровня зарплат по годам для выбранной профессии
+
+        Returns:
+            dict: Динамика уровня зарплат по годам для выбранной профессии
+        """
+        if not self.vacancyMask.any():
+            return {year: 0 for year in self.__GroupByYear(self.years)[0]}
+        return self.__SalariesByYear(self.vacancyMask)
+
+    def DynamicsCountVacanciesAtVacancy(self):
+        """
+        Возвращает динамику количества вакансий по годам для выбранной профессии
+
+        Returns:
+            dict: Динамика количества вакансий по годам для выбранной профессии
+        """
+        if not self.vacancyMask.any():
+            return {year: 0 for year in self.__GroupByYear(self.years)[0]}
+        return self.__CountByYear(self.vacancyMask)
+
+    def CitiesSalaryLevel(self):
+        """
+        Возвращает уровень зарплат по городам (в порядке убывания)
+
+        Returns:
+            dict: Уровень зарплат по городам
+        """
+        codes, sums, counts = self.__AreaTotals()
+        salaries = {self.areaNames[code]: int(sums[i] / counts[i]) for i, code in enumerate(codes)}
+        return dict(sorted(salaries.items(), key=lambda item: item[1], reverse=True))
+
+    def CitiesRatioVacancies(self):
+        """
+        Возвращает долю вакансий по городам (в порядке убывания)
+
+        Returns:
+            dict: Доля вакансий по городам
+        """
+        codes, sums, counts = self.__AreaTotals()
+        ratios = {self.areaNames[code]: round(int(counts[i]) / len(self.areaCodes), 4) for i, code in enumerate(codes)}
+        return dict(sorted(ratios.items(), key=lambda item: item[1], reverse=True))
+
+
 class Salary:
     """
     Класс представления зарплаты.
@@ -427,6 +620,7 @@ class Report:
         Args:
             vacancyName (str): название профессий
         """
+        self.vacancyName = vacancyName
 
     def CheckEmptyText(self, value):
         """
@@ -442,65 +636,6 @@ class Report:
             return ""
         return str(value)
 
-    def __CompleteSheet(self, sheet, data, indexesData, count=None):
-        """
-        Заполняет таблицу данными из списка, в указанном диапазоне.
-        Если указано количество необходимых данных, отсчитывает количество от начала списка
-
-        Args:
-            sheet (Worksheet): Excel страница (таблица)
-            data list[dict]: Данные
-            indexesData (tuple): Диапазон данных
-            count (int): Количество данных
-
-        Returns:
-            Таблица с данными из списка, в указанном диапазоне.
-        """
-        i, j = indexesData
-        if count is None:
-            count = len(data[i].keys()) + 1
-        for year in list(data[i].keys())[:count]:
-            row = [year]
-            for dictData in data[i:j]:
-                row.append(dictData[year])
-            sheet.append(row)
-        return sheet
-
-    def __CopySheetToSheet(self, sheet1, sheet2):
-        """
-        Копирует содержимое одной таблицы  в другую с отступом в один столбец
-
-        Args:
-            sheet1 (Worksheet): Копируемая таблица
-            sheet2 (Worksheet): Таблица, в которую необходимо скопировать данные
-
-        Returns:
-            Таблица с данными из другой таблицы
-        """
-        maxColumn = sheet2.max_column
-        for i in range(1, sheet1.max_row + 1):
-            for j in range(1, sheet1.max_column + 1):
-                sheet2.cell(row=i + 1, column=maxColumn + j - 2).value = sheet1.cell(row=i, column=j).value
-        return sheet2
-
-    def __StyleSheet(self, sheet, headingsStyle, cellStyle):
-        """
-        Устанавливает стили заголовков и ячеек для таблицы
-
-        Args:
-            sheet (Worksheet): Таблица
-            headingsStyle (NamedStyle): Стиль заголовков
-            cellStyle (NamedStyle): стиль ячеек
-        """
-        for row in sheet.rows:
-            for cell in row:
-                cell.style = cellStyle
-        for cell in sheet["1:1"]:
-            cell.style = headingsStyle
-        for column in sheet.columns:
-            length = max(len(self.CheckEmptyText(cell.value)) for cell in column)
-            sheet.column_dimensions[column[0].column_letter].width = length + 2
-
     def GenerateExcel(self, listData):
         """
         Формирует Excel файл "report.xlsx", в котором представлены динамики данных из файла в виде таблиц
@@ -508,147 +643,60 @@ class Report:
         Args:
             listData list[dict]: Данные файла
         """
-        book = openpyxl.Workbook()
-        book.remove(book.active)
-        sheet1 = book.create_sheet("Статистика по годам")
-        sheet2 = book.create_sheet("Статистика по городам")
-        headingsByYear = ["Год", "Средняя зарплата", f'Средняя зарплата - {self.vacancyName}', "Количество вакансий",
-                          f'Количество вакансий - {self.vacancyName}']
-        headingsByCity = ["Город", "Уровень зарплат", "", "Город", "Доля вакансий"]
-        sheet1.append(headingsByYear)
-        sheet2.append(headingsByCity)
-
-        headingsStyle = NamedStyle(name='headingsStyle')
-        headingsStyle.font = Font(bold=True)
-        headingsStyle.border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'),
-                                      bottom=Side(style='thin'))
-        cellStyle = NamedStyle(name='cellStyle')
-        cellStyle.border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'),
-                                  bottom=Side(style='thin'))
-
-        tempSheet = book.create_sheet("tempSheet")
-        sheet1 = self.__CompleteSheet(sheet1, listData, (0, 4))
-        sheet2 = self.__CompleteSheet(sheet2, listData, (4, 5), 10)
-        tempSheet = self.__CompleteSheet(tempSheet, listData, (5, 6), 10)
-        sheet2 = self.__CopySheetToSheet(tempSheet, sheet2)
-        self.__StyleSheet(sheet1, headingsStyle, cellStyle)
-        self.__StyleSheet(sheet2, headingsStyle, cellStyle)
-        book.remove(tempSheet)
-
-        for cell in sheet2["C"]:
-            cell.border = Border(top=Side(style=None),
-                                 bottom=Side(style=None))
-        for cell in sheet2["E"]:
-            cell.number_format = '0.00%'
-        book.save("report.xlsx")
-
-    def __CreateVerticalBars(self, ax, title, data1, data2, label1, label2, rotation):
-        """
-        Формирует вертикальную диаграмму для двух данных
-
-        Args:
-            ax (axes.SubplotBase): График
-            title (str): Заголовок диаграммы
-            data1 (dict): Общие данные
-            data2 (dict): Данные для выбранной профессии
-            label1 (str): Надпись легенды для общих данных
-            label2 (str): Надпись легенды для данные выбранной профессии
-            rotation (int): Угол поворота надписей оси X
+        GenerateStatisticsExcel("report.xlsx", listData, self.vacancyName)
 
-        Returns:
-            axes.SubplotBase: График
-        """
-        xIndexes = np.arange(len(data1.keys()))
-        width = 0.35
-        ax.set_title(title)
-        ax.bar(xIndexes - width / 2, data1.values(), width, label=label1)
-        ax.bar(xIndexes + width / 2, data2.values(), width, label=label2)
-        ax.legend()
-        ax.grid(axis="y", visible=True)
-        ax.set_xticks(xIndexes, data1.keys(), rotation=rotation)
-        return ax
-
-    def __CreateHorizontalBar(self, ax, title, data):
+    def GenerateVacanciesExcel(self, fileName):
         """
-        Формирует горизонтальную диаграмму
+        Формирует Excel файл "vacancies.xlsx" с исходной таблицей вакансий (построчно, без загрузки файла в память)
 
         Args:
-            ax (axes.SubplotBase): График
-            title (str): Заголовок диаграммы
-            data (dict): Данные
-
-        Returns:
-            axes.SubplotBase: График
+            fileName (str): Название CSV файла с вакансиями
         """
-        width = 0.35
-        ax.set_title(title)
-        ax.barh(list(data.keys())[:10], list(data.values())[:10], width)
-        ax.grid(axis="x", visible=True)
-        ax.invert_yaxis()
-        return ax
+        GenerateVacanciesExcel("vacancies.xlsx", fileName)
 
-    def __CreatePie(self, ax, title, data):
+    def GenerateImage(self, listData):
         """
-        Формирует круговую диаграмму
+        Формирует изображение со статистикой вакансий в виде графиков (в памяти, без файла "graph.png")
 
         Args:
-            ax (axes.SubplotBase): График
-            title (str): Заголовок диаграммы
-            data (dict): Данные
+            listData: Данные файла
 
         Returns:
-            axes.SubplotBase: График
+            str: Изображение в виде data URI для встраивания в HTML шаблон
         """
-        plt.rc('font', size=6)
-        ax.set_title(title)
-        ax.pie(data.values(), labels=data.keys(), labeldistance=1.1, startangle=-30)
-        return ax
+        return ChartRenderer(self.vacancyName).RenderDataURI(listData)
 
-    def GenerateImage(self, listData):
+    def GeneratePDF(self, listData):
         """
-        Формирует изображение "graph.png" со статистикой вакансий в виде графиков
+        Формирует отчет  "report.pdf" со всей статистикой в виде графиков и таблицы, а также "report.xlsx".
+        Excel файл и изображение формируются параллельно в отдельных процессах,
+        PDF - сразу после готовности изображения. Выводит время формирования каждого файла
 
         Args:
-            listData: Данные файла
+            listData: Данные файла:
         """
-        plt.rc('font', size=8)
-        figure = plt.figure()
-        ax1 = figure.add_subplot(2, 2, 1)
-        ax2 = figure.add_subplot(2, 2, 2)
-        ax1 = self.__CreateVerticalBars(ax1, "Уровень зарплат по годам", listData[0], listData[1], "средняя з/п",
-                                        f'з/п {self.vacancyName}', 90)
-        ax2 = self.__CreateVerticalBars(ax2, "Уровень зарплат по годам", listData[2], listData[3],
-                                        "Количество вакансий", f'Количество вакансий {self.vacancyName}', 90)
-        ax3 = figure.add_subplot(2, 2, 3)
-        ax3 = self.__CreateHorizontalBar(ax3, "Уровень зарплат по городам", listData[4])
-        plt.rc('font', size=6)
-        tempDict = {k: v for k, v in list(listData[5].items())[:10]}
-        tempDict["Другие"] = 1 - sum(tempDict.values())
-        tempDict = dict(sorted(tempDict.items(), key=lambda x: x[1]))
-        ax4 = figure.add_subplot(2, 2, 4)
-        ax4 = self.__CreatePie(ax4, "Доля вакансий по городам", tempDict)
-        plt.tight_layout()
-        plt.savefig("graph.png")
-        plt.show()
+        pipeline = ArtifactPipeline()
+        pipeline.AddArtifact("report.xlsx", GenerateStatisticsExcel, "report.xlsx", listData, self.vacancyName)
+        pipeline.AddArtifact("graph", ChartRenderer(self.vacancyName).RenderDataURI, listData)
+        pipeline.AddArtifact("report.pdf", self.RenderPDF, listData, dependsOn=("graph",))
+        pipeline.Run()
+        pipeline.PrintTimings()
 
-    def GeneratePDF(self, listData):
+    def RenderPDF(self, listData, image):
         """
-        Формирует отчет  "report.pdf" со всей статистикой в виде графиков и таблицы
+        Формирует отчет "report.pdf" по HTML шаблону
 
         Args:
-            listData: Данные файла:
+            listData: Данные файла
+            image (str): Изображение с графиками (data URI)
         """
-
-        self.GenerateExcel(listData)
-        self.GenerateImage(listData)
-
         env = Environment(loader=FileSystemLoader('.'))
         template = env.get_template("pdfTemplate.html")
         headingsByYear = ["Год", "Средняя зарплата", f'Средняя зарплата - {self.vacancyName}', "Количество вакансий",
                           f'Количество вакансий - {self.vacancyName}']
         headingsByCity = ["Город", "Уровень зарплат", "", "Город", "Доля вакансий"]
         pdfTemplate = template.render({
-            "fileName": "graph.png",
+            "fileName": image,
             "vacancyName": self.vacancyName,
             "headingsByYear": headingsByYear,
             "headingsByCity": headingsByCity,
@@ -665,9 +713,10 @@ class Report:
         pdfkit.from_string(pdfTemplate, "report.pdf", configuration=config, options=options)
 
 
-inputData = InputConnect()
-dataSet = DataSet(inputData.fileName, inputData.vacancyName)
-inputData.PrintData(dataSet)
+if __name__ == "__main__":
+    inputData = InputConnect()
+    dataSet = ColumnarDataSet(inputData.fileName, inputData.vacancyName)
+    inputData.PrintData(dataSet)
 
-reportData = Report(dataSet.vacancyNameParameter)
-reportData.GeneratePDF(inputData.GetListData((dataSet)))
\ No newline at end of file
+    reportData = Report(dataSet.vacancyNameParameter)
+    reportData.GeneratePDF(inputData.GetListData((dataSet)))
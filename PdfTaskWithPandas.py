@@ -15,9 +15,7 @@ if __name__ == "__main__":
     dynamicsCalculator = Calculator(vacancyName, areaName)
     with ThreadPoolExecutor(os.cpu_count() * 3) as ex:
         res = ex.map(dynamicsCalculator.GetDynamicsByYear,
-                     [f'CsvFilesByYear\\DataByYear{year}.csv' for year in splitter.years], splitter.years)
-    generalSalaries, generalCount, vacancySalaries, vacancyCount = dynamicsCalculator.HandleResults(res)
-    citiesSalaryData, citiesRatioData = dynamicsCalculator.GetDynamicsByCity(convertedCurrenciesFile)
-    data = [generalSalaries, generalCount, vacancySalaries, vacancyCount, citiesSalaryData, citiesRatioData]
+                     [splitter.GetFileName(partition) for partition in splitter.partitions], splitter.partitions)
+    data = list(dynamicsCalculator.HandleResults(res))
     report = Report(vacancyName, areaName)
     report.GeneratePDF(data)
\ No newline at end of file
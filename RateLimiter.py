@@ -0,0 +1,108 @@
+import collections
+import threading
+import time
+
+
+class TokenBucket:
+    # Общий для всех потоков лимит запросов в секунду. Токен резервируется сразу (счетчик может уйти в минус),
+    # поэтому ожидающие потоки получают запросы по очереди и спят без блокировки
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.pausedUntil = 0
+        self.lock = threading.Lock()
+
+    def Acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            delay = max(-self.tokens / self.rate, self.pausedUntil - now, 0)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def Pause(self, seconds):
+        # После 429 запросы не отправляет ни один поток, пока не пройдет Retry-After
+        with self.lock:
+            self.pausedUntil = max(self.pausedUntil, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    # После failureThreshold ошибок подряд запросы не отправляются resetTimeout секунд,
+    # затем проходит один пробный запрос: успех закрывает цепь, ошибка снова размыкает ее
+    def __init__(self, failureThreshold=5, resetTimeout=30):
+        self.failureThreshold = failureThreshold
+        self.resetTimeout = resetTimeout
+        self.failures = 0
+        self.openedAt = None
+        self.isTrialRunning = False
+        self.opensCount = 0
+        self.condition = threading.Condition()
+
+    def Acquire(self):
+        with self.condition:
+            while True:
+                if self.openedAt is None:
+                    return
+                remaining = self.openedAt + self.resetTimeout - time.monotonic()
+                if remaining <= 0 and not self.isTrialRunning:
+                    self.isTrialRunning = True
+                    return
+                self.condition.wait(remaining if remaining > 0 else None)
+
+    def RecordSuccess(self):
+        with self.condition:
+            self.failures = 0
+            self.openedAt = None
+            self.isTrialRunning = False
+            self.condition.notify_all()
+
+    def RecordFailure(self):
+        with self.condition:
+            self.failures += 1
+            if self.isTrialRunning or (self.failures >= self.failureThreshold and self.openedAt is None):
+                self.openedAt = time.monotonic()
+                self.opensCount += 1
+            self.isTrialRunning = False
+            self.condition.notify_all()
+
+
+class RequestStatistics:
+    # Перцентили задержки считаются по последним latencyWindow запросам, чтобы память постоянного сбора не росла
+    def __init__(self, latencyWindow=10000):
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.errors = 0
+        self.latencies = collections.deque(maxlen=latencyWindow)
+        self.lock = threading.Lock()
+
+    def AddRequest(self, latency, isRetry=False, isThrottled=False, isError=False):
+        with self.lock:
+            self.requests += 1
+            self.retries += isRetry
+            self.throttled += isThrottled
+            self.errors += isError
+            self.latencies.append(latency)
+
+    def GetPercentile(self, percent):
+        with self.lock:
+            latencies = sorted(self.latencies)
+        if not latencies:
+            return 0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+    def GetSummary(self):
+        return {"requests": self.requests, "retries": self.retries, "throttled": self.throttled,
+                "errors": self.errors, "p50": self.GetPercentile(50), "p90": self.GetPercentile(90),
+                "p99": self.GetPercentile(99)}
+
+    def PrintStatistics(self):
+        summary = self.GetSummary()
+        print(f'Запросов: {summary["requests"]}, повторов: {summary["retries"]}, 429: {summary["throttled"]}, '
+              f'ошибок: {summary["errors"]}, задержка p50/p90/p99: {summary["p50"] * 1000:.0f}/'
+              f'{summary["p90"] * 1000:.0f}/{summary["p99"] * 1000:.0f} мс')
@@ -0,0 +1,294 @@
+import base64
+import io
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+class ChartRenderer:
+    """
+    Класс, формирующий графики статистики вакансий без использования глобального состояния pyplot.
+    Каждый график рисуется на собственном объекте Figure с холстом Agg и сохраняется в память,
+    поэтому отчеты можно формировать параллельно и без графического интерфейса.
+
+    Attributes:
+        vacancyName (str): Название профессии
+        areaName (str): Название региона
+        pieStartAngle (int): Начальный угол круговой диаграммы
+        fontSize (int): Размер шрифта графиков
+        smallFontSize (int): Размер шрифта подписей круговой диаграммы
+    """
+    fontSize = 8
+    smallFontSize = 6
+
+    def __init__(self, vacancyName, areaName=None, pieStartAngle=-30, othersFromRest=False):
+        """
+        Инициализирует объект ChartRenderer
+
+        Args:
+            vacancyName (str): Название профессии
+            areaName (str): Название региона
+            pieStartAngle (int): Начальный угол круговой диаграммы
+            othersFromRest (bool): Доля "Другие" - сумма долей остальных городов (иначе - остаток до 1)
+        """
+        self.vacancyName = vacancyName
+        self.areaName = areaName
+        self.pieStartAngle = pieStartAngle
+        self.othersFromRest = othersFromRest
+
+    def __GetTitle(self, title):
+        """
+        Добавляет к заголовку графика по годам название региона, если он указан
+
+        Args:
+            title (str): Заголовок диаграммы
+
+        Returns:
+            str: Заголовок диаграммы
+        """
+        return title if self.areaName is None else f'{title}\n в регионе {self.areaName}'
+
+    def __CreateVerticalBars(self, ax, title, data1, data2, label1, label2, rotation):
+        """
+        Формирует вертикальную диаграмму для двух данных
+
+        Args:
+            ax (Axes): График
+            title (str): Заголовок диаграммы
+            data1 (dict): Общие данные
+            data2 (dict): Данные для выбранной профессии
+            label1 (str): Надпись легенды для общих данных
+            label2 (str): Надпись легенды для данные выбранной профессии
+            rotation (int): Угол поворота надписей оси X
+
+        Returns:
+            Axes: График
+        """
+        xIndexes = np.arange(len(data1.keys()))
+        width = 0.35
+        ax.set_title(title, fontsize=self.fontSize)
+        ax.bar(xIndexes - width / 2, list(data1.values()), width, label=label1)
+        ax.bar(xIndexes + width / 2, [data2.get(key, 0) for key in data1.keys()], width, label=label2)
+        ax.legend(fontsize=self.fontSize)
+        ax.grid(axis="y", visible=True)
+        ax.set_xticks(xIndexes, list(data1.keys()), rotation=rotation)
+        ax.tick_params(axis="both", labelsize=self.fontSize)
+        return ax
+
+    def __CreateHorizontalBar(self, ax, title, data):
+        """
+        Формирует горизонтальную диаграмму
+
+        Args:
+            ax (Axes): График
+            title (str): Заголовок диаграммы
+            data (dict): Данные
+
+        Returns:
+            Axes: График
+        """
+        yIndexes = np.arange(len(list(data.keys())[:10]))
+        width = 0.35
+        ax.set_title(title, fontsize=self.fontSize)
+        ax.barh(yIndexes, list(data.values())[:10], width)
+        ax.set_yticks(yIndexes, list(data.keys())[:10])
+        ax.grid(axis="x", visible=True)
+        ax.invert_yaxis()
+        ax.tick_params(axis="both", labelsize=self.fontSize)
+        return ax
+
+    def __CreatePie(self, ax, title, data):
+        """
+        Формирует круговую диаграмму
+
+        Args:
+            ax (Axes): График
+            title (str): Заголовок диаграммы
+            data (dict): Данные
+
+        Returns:
+            Axes: График
+        """
+        ax.set_title(title, fontsize=self.smallFontSize)
+        ax.pie(list(data.values()), labels=list(data.keys()), labeldistance=1.1, startangle=self.pieStartAngle,
+               textprops={'fontsize': self.smallFontSize})
+        return ax
+
+    def __UpdateVerticalBars(self, ax, title, data1, data2, label1, label2, rotation):
+        """
+        Обновляет высоты столбцов, подписи и легенду вертикальной диаграммы без пересоздания осей.
+        Если количество столбцов изменилось - перерисовывает диаграмму
+
+        Args:
+            ax (Axes): График
+            title (str): Заголовок диаграммы
+            data1 (dict): Общие данные
+            data2 (dict): Данные для выбранной профессии
+            label1 (str): Надпись легенды для общих данных
+            label2 (str): Надпись легенды для данные выбранной профессии
+            rotation (int): Угол поворота надписей оси X
+
+        Returns:
+            Axes: График
+        """
+        if len(ax.containers) != 2 or len(ax.containers[0]) != len(data1):
+            ax.clear()
+            return self.__CreateVerticalBars(ax, title, data1, data2, label1, label2, rotation)
+        for rect, value in zip(ax.containers[0], data1.values()):
+            rect.set_height(value)
+        for rect, key in zip(ax.containers[1], data1.keys()):
+            rect.set_height(data2.get(key, 0))
+        for text, label in zip(ax.get_legend().get_texts(), (label1, label2)):
+            text.set_text(label)
+        ax.set_title(title, fontsize=self.fontSize)
+        ax.set_xticks(np.arange(len(data1.keys())), list(data1.keys()), rotation=rotation)
+        ax.relim()
+        ax.autoscale_view()
+        return ax
+
+    def __UpdateHorizontalBar(self, ax, title, data):
+        """
+        Обновляет длины столбцов и подписи горизонтальной диаграммы без пересоздания осей.
+        Если количество столбцов изменилось - перерисовывает диаграмму
+
+        Args:
+            ax (Axes): График
+            title (str): Заголовок диаграммы
+            data (dict): Данные
+
+        Returns:
+            Axes: График
+        """
+        keys = list(data.keys())[:10]
+        if len(ax.containers) != 1 or len(ax.containers[0]) != len(keys):
+            ax.clear()
+            return self.__CreateHorizontalBar(ax, title, data)
+        for rect, value in zip(ax.containers[0], list(data.values())[:10]):
+            rect.set_width(value)
+        ax.set_title(title, fontsize=self.fontSize)
+        ax.set_yticks(np.arange(len(keys)), keys)
+        ax.relim()
+        ax.autoscale_view()
+        return ax
+
+    @staticmethod
+    def GetPieData(citiesRatio, othersFromRest=False):
+        """
+        Формирует данные круговой диаграммы: первые 10 городов и доля остальных ("Другие")
+
+        Args:
+            citiesRatio (dict): Доля вакансий по городам (в порядке убывания)
+            othersFromRest (bool): Доля "Другие" - сумма долей городов после первых 10 (иначе - остаток до 1)
+
+        Returns:
+            dict: Доли вакансий, отсортированные по возрастанию
+        """
+        pieData = {k: v for k, v in list(citiesRatio.items())[:10]}
+        if othersFromRest:
+            pieData["Другие"] = sum(list(citiesRatio.values())[10:])
+        else:
+            pieData["Другие"] = 1 - sum(pieData.values())
+        return dict(sorted(pieData.items(), key=lambda x: x[1]))
+
+    def CreateFigure(self, listData):
+        """
+        Формирует объект Figure со статистикой вакансий в виде четырех графиков
+
+        Args:
+            listData (list[dict]): Данные файла в порядке: уровень зарплат, уровень зарплат для профессии,
+                количество вакансий, количество вакансий для профессии, зарплаты по городам, доли по городам
+
+        Returns:
+            Figure: Полотно с графиками
+        """
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        ax1, ax2, ax3, ax4 = (figure.add_subplot(2, 2, i) for i in range(1, 5))
+        self.__CreateVerticalBars(ax1, self.__GetTitle("Уровень зарплат по годам"), listData[0], listData[1],
+                                  "средняя з/п", f'з/п {self.vacancyName}', 90)
+        self.__CreateVerticalBars(ax2, self.__GetTitle("Количество вакансий по годам"), listData[2], listData[3],
+                                  "Количество вакансий", f'Количество вакансий {self.vacancyName}', 90)
+        self.__CreateHorizontalBar(ax3, "Уровень зарплат по городам", listData[4])
+        self.__CreatePie(ax4, "Доля вакансий по городам", self.GetPieData(listData[5], self.othersFromRest))
+        figure.tight_layout()
+        return figure
+
+    def UpdateFigure(self, figure, listData):
+        """
+        Обновляет уже созданное полотно новыми данными: столбцы диаграмм изменяются на месте,
+        компоновка полотна сохраняется, заново рисуется только круговая диаграмма.
+        Позволяет использовать одно полотно для серии отчетов
+
+        Args:
+            figure (Figure): Полотно с графиками, созданное CreateFigure
+            listData (list[dict]): Данные файла (в том же порядке, что и для CreateFigure)
+
+        Returns:
+            Figure: Полотно с графиками
+        """
+        ax1, ax2, ax3, ax4 = figure.axes
+        self.__UpdateVerticalBars(ax1, self.__GetTitle("Уровень зарплат по годам"), listData[0], listData[1],
+                                  "средняя з/п", f'з/п {self.vacancyName}', 90)
+        self.__UpdateVerticalBars(ax2, self.__GetTitle("Количество вакансий по годам"), listData[2], listData[3],
+                                  "Количество вакансий", f'Количество вакансий {self.vacancyName}', 90)
+        self.__UpdateHorizontalBar(ax3, "Уровень зарплат по городам", listData[4])
+        ax4.clear()
+        self.__CreatePie(ax4, "Доля вакансий по городам", self.GetPieData(listData[5], self.othersFromRest))
+        return figure
+
+    @staticmethod
+    def RenderFigure(figure, imageFormat="png"):
+        """
+        Сохраняет полотно с графиками в буфер памяти
+
+        Args:
+            figure (Figure): Полотно с графиками
+            imageFormat (str): Формат изображения ("png" или "svg")
+
+        Returns:
+            bytes: Содержимое изображения
+        """
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format=imageFormat)
+        return buffer.getvalue()
+
+    @staticmethod
+    def ToDataURI(image, imageFormat="png"):
+        """
+        Преобразует изображение в data URI для встраивания в HTML шаблон
+
+        Args:
+            image (bytes): Содержимое изображения
+            imageFormat (str): Формат изображения ("png" или "svg")
+
+        Returns:
+            str: data URI изображения
+        """
+        mimeType = "image/svg+xml" if imageFormat == "svg" else f'image/{imageFormat}'
+        return f'data:{mimeType};base64,{base64.b64encode(image).decode("ascii")}'
+
+    def Render(self, listData, imageFormat="png"):
+        """
+        Формирует изображение со статистикой вакансий в памяти
+
+        Args:
+            listData (list[dict]): Данные файла
+            imageFormat (str): Формат изображения ("png" или "svg")
+
+        Returns:
+            bytes: Содержимое изображения
+        """
+        return self.RenderFigure(self.CreateFigure(listData), imageFormat)
+
+    def RenderDataURI(self, listData, imageFormat="png"):
+        """
+        Формирует изображение со статистикой вакансий в виде data URI
+
+        Args:
+            listData (list[dict]): Данные файла
+            imageFormat (str): Формат изображения ("png" или "svg")
+
+        Returns:
+            str: data URI изображения
+        """
+        return self.ToDataURI(self.Render(listData, imageFormat), imageFormat)
@@ -0,0 +1,72 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+class ResponseCache:
+    # Ответы HTTP на диске в SQLite, сжатые zlib. Ключ - хеш нормализованного URL вместе с параметрами,
+    # поэтому один и тот же запрос, записанный по-разному (порядок параметров, параметры в строке URL),
+    # берется из одной записи. Запись устаревает через maxAge секунд, а ответы за закрытые периоды
+    # (прошедшие окна HH, курсы ЦБ на прошедшие даты) не устаревают никогда
+    def __init__(self, fileName="ResponseCache.db", maxAge=3600):
+        self.fileName = fileName
+        self.maxAge = maxAge
+        self.hits = 0
+        self.misses = 0
+        # Одно соединение на все потоки сборщика, обращения к нему - под блокировкой
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(fileName, check_same_thread=False)
+        self.connection.execute("""CREATE TABLE IF NOT EXISTS responses
+            (key TEXT PRIMARY KEY, url TEXT, created REAL, expires REAL, content BLOB)""")
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+
+    @staticmethod
+    def GetKey(url, params=None):
+        scheme, host, path, query, _ = urlsplit(url)
+        parameters = parse_qsl(query, keep_blank_values=True)
+        parameters += [(str(key), str(value)) for key, value in (params or {}).items()]
+        normalizedUrl = urlunsplit((scheme.lower(), host.lower(), path or "/", urlencode(sorted(parameters)), ""))
+        return hashlib.sha256(normalizedUrl.encode("utf-8")).hexdigest(), normalizedUrl
+
+    def Get(self, url, params=None):
+        key, _ = self.GetKey(url, params)
+        with self.lock:
+            row = self.connection.execute("SELECT content, expires FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return None
+        return zlib.decompress(row[0])
+
+    def Set(self, url, params, content, neverExpires=False):
+        key, normalizedUrl = self.GetKey(url, params)
+        created = time.time()
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                                    (key, normalizedUrl, created, None if neverExpires else created + self.maxAge,
+                                     zlib.compress(content)))
+
+    def Fetch(self, url, params, download, neverExpires=False):
+        # download() вызывается только при промахе и возвращает тело ответа в байтах
+        content = self.Get(url, params)
+        with self.lock:
+            if content is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if content is not None:
+            return content
+        content = download()
+        self.Set(url, params, content, neverExpires)
+        return content
+
+    def Close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.Close()
@@ -0,0 +1,134 @@
+import sys
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+import pandas as pd
+from VacancyLoader import LoadVacancies
+
+# Блоки разделяемой памяти, к которым подключен текущий процесс (в том числе созданные им): имя - SharedMemory
+attachedBlocks = {}
+
+
+def OpenBlock(name):
+    # Блок удаляет создавший его процесс, поэтому подключившийся процесс не регистрирует его в resource_tracker,
+    # иначе трекер процесса пула удалит блок или предупредит о нем при завершении (в Python 3.13+ - track=False)
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register, resource_tracker.register = resource_tracker.register, lambda *args: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def AttachArray(name, dtype, length):
+    block = attachedBlocks.get(name)
+    if block is None:
+        block = attachedBlocks[name] = OpenBlock(name)
+    return np.ndarray((length,), dtype=dtype, buffer=block.buf)
+
+
+def GetPeriods(months, granularity="year"):
+    # Векторный аналог Splitter.GetPeriodReader: те же ключи партиций. months - int32 коды ггггмм
+    # (VacancyLoader, dates="month"), ключ считается один раз для каждого месяца
+    months, inverse = np.unique(np.asarray(months), return_inverse=True)
+    if granularity == "year":
+        return (months // 100)[inverse]
+    if granularity == "quarter":
+        return np.array([f'{month // 100}Q{(month % 100 + 2) // 3}' for month in months], dtype=object)[inverse]
+    if granularity == "month":
+        return np.array([f'{month // 100}-{month % 100:02}' for month in months], dtype=object)[inverse]
+    raise ValueError(f'Неизвестная гранулярность партиций "{granularity}"')
+
+
+class SharedSlice:
+    # Описание партиции, которое передается процессам пула вместо имени файла:
+    # имена блоков разделяемой памяти и диапазон строк партиции в них
+    def __init__(self, columns, offset, length):
+        self.columns = columns
+        self.offset = offset
+        self.length = length
+
+    def LoadColumns(self, columns=None):
+        # Колонки - представления блоков разделяемой памяти без копирования строк
+        data = {}
+        for column in columns or self.columns:
+            name, dtype, length, categories = self.columns[column]
+            values = AttachArray(name, dtype, length)[self.offset:self.offset + self.length]
+            if categories is not None:
+                values = pd.Categorical.from_codes(values, categories=AttachArray(*categories))
+            data[column] = values
+        return pd.DataFrame(data, copy=False)
+
+    def GetSize(self):
+        return self.length * sum(np.dtype(dtype).itemsize for _, dtype, _, _ in self.columns.values())
+
+
+class SharedPartitions:
+    columns = ("name", "salary", "area_name")
+
+    def __init__(self, fileName, granularity="year", maxPartitionRows=None):
+        # Файл читается один раз, строки группируются по партициям и кладутся колонками в разделяемую память.
+        # Вместо CSV файлов на партицию - SharedSlice с диапазоном строк, поэтому нет записи на диск
+        # и повторного разбора. Блоки освобождаются в Close (или при выходе из with)
+        self.blocks = []
+        df = LoadVacancies(fileName, list(self.columns) + ["published_at"], dates="month")
+        codes, periods = pd.factorize(GetPeriods(df["published_at"], granularity))
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=len(periods))
+        self.slicesColumns = {column: self.ShareColumn(df[column], order) for column in self.columns}
+        del df
+        self.slices = {}
+        offset = 0
+        for period, count in zip(periods, counts):
+            period = period.item() if isinstance(period, np.generic) else period
+            if maxPartitionRows is None:
+                self.slices[period] = SharedSlice(self.slicesColumns, offset, int(count))
+            else:
+                for chunk, chunkOffset in enumerate(range(offset, offset + count, maxPartitionRows)):
+                    length = min(maxPartitionRows, offset + count - chunkOffset)
+                    self.slices[f'{period}_{chunk}'] = SharedSlice(self.slicesColumns, chunkOffset, int(length))
+            offset += count
+        self.partitions = list(self.slices)
+        self.years = list(dict.fromkeys(int(str(partition)[0:4]) for partition in self.partitions))
+
+    def ShareColumn(self, column, order):
+        # Строки кладутся кодами int32 и отдельным блоком уникальных значений; категории загрузчика уже закодированы
+        categories = None
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            categories = self.ShareArray(np.asarray(column.cat.categories, dtype=str))
+            values = column.cat.codes.to_numpy().astype(np.int32)[order]
+        elif column.dtype == object or pd.api.types.is_string_dtype(column.dtype):
+            codes, uniques = pd.factorize(column.to_numpy()[order])
+            categories = self.ShareArray(np.asarray(uniques, dtype=str))
+            values = codes.astype(np.int32)
+        else:
+            values = column.to_numpy()[order]
+        return self.ShareArray(values) + (categories,)
+
+    def ShareArray(self, values):
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        self.blocks.append(block)
+        attachedBlocks[block.name] = block
+        np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+        return block.name, values.dtype.str, len(values)
+
+    def GetFileName(self, partition):
+        # Тот же интерфейс, что у Splitter: результат передается в Calculator.GetDynamicsByYear
+        return self.slices[partition]
+
+    @staticmethod
+    def IsSlice(fileName):
+        return isinstance(fileName, SharedSlice)
+
+    def Close(self):
+        for block in self.blocks:
+            attachedBlocks.pop(block.name, None)
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.Close()
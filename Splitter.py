@@ -1,16 +1,254 @@
-import pandas as pd
+import csv
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from ColumnarPartitions import ColumnarPartitions
+from CsvRowIndex import CsvRowIndex
+
+bufferSize = 1 << 20
+
+
+def ReadRecords(file, start, end):
+    # Записи с переводом строки внутри кавычек склеиваются: у такой записи нечетное число кавычек.
+    # Читаются записи, которые начинаются в диапазоне байтов [start, end)
+    file.seek(start)
+    position = start
+    record = b""
+    for line in file:
+        if not record and position >= end:
+            return
+        position += len(line)
+        record += line
+        if record.count(b'"') % 2 == 0:
+            if record.strip():
+                yield record if record.endswith(b"\n") else record + b"\n"
+            record = b""
+    if record.strip():
+        yield record + b"\n"
+
+
+def GetPeriodReader(columns, granularity="year"):
+    # Возвращает функцию, которая по записи определяет ее период: год (int), квартал ("2022Q3") или месяц ("2022-07")
+    dateIndex = columns.index("published_at")
+    if dateIndex == len(columns) - 1:
+        # published_at - последняя колонка, период берется по префиксу даты без разбора всей строки
+        getDate = lambda record: record[record.rindex(b",") + 1:].lstrip(b'"')[0:7].decode("ascii")
+    else:
+        getDate = lambda record: next(csv.reader([record.decode("utf-8")]))[dateIndex][0:7]
+    if granularity == "year":
+        return lambda record: int(getDate(record)[0:4])
+    if granularity == "quarter":
+        return lambda record: (lambda date: f'{date[0:4]}Q{(int(date[5:7]) + 2) // 3}')(getDate(record))
+    if granularity == "month":
+        return getDate
+    raise ValueError(f'Неизвестная гранулярность партиций "{granularity}"')
+
+
+def GetPartitionYear(partition):
+    return int(str(partition)[0:4])
+
+
+def GetPartitionFileName(outputPath, prefix, suffix, partition):
+    # Имя файла собирается без str.format, поэтому фигурные скобки в пути и имени допустимы
+    return os.path.join(outputPath, f'{prefix}{partition}{suffix}')
+
+
+def SplitRange(fileName, start, end, header, getFileName, writeHeader=True, append=False,
+               granularity="year", maxPartitionBytes=None):
+    # Раскладывает записи диапазона байтов по файлам getFileName(partition),
+    # для фрагментов заголовок не пишется, при append записи дописываются в конец существующих файлов.
+    # При maxPartitionBytes период делится на куски "{период}_{start}_{номер}": start делает имена кусков
+    # уникальными для разных диапазонов и запусков, поэтому куски никогда не дописываются.
+    # Возвращает партиции в порядке появления
+    getPeriod = GetPeriodReader(next(csv.reader([header.decode("utf-8")])), granularity)
+    writers, chunks, partitions = {}, {}, {}
+    try:
+        with open(fileName, "rb") as file:
+            for record in ReadRecords(file, start, end):
+                partition = getPeriod(record)
+                if maxPartitionBytes is not None:
+                    chunk = chunks.get(partition)
+                    if chunk is None or chunk[1] >= maxPartitionBytes:
+                        if chunk is not None:
+                            # Заполненный кусок больше не пополняется, его файл закрывается сразу
+                            writers.pop(f'{partition}_{start}_{chunk[0]}').close()
+                        chunk = chunks[partition] = [0 if chunk is None else chunk[0] + 1, 0]
+                    chunk[1] += len(record)
+                    partition = f'{partition}_{start}_{chunk[0]}'
+                writer = writers.get(partition)
+                if writer is None:
+                    partitionFileName = getFileName(partition)
+                    isNewFile = not append or not os.path.exists(partitionFileName)
+                    writer = open(partitionFileName, "wb" if isNewFile else "ab", buffering=bufferSize)
+                    if writeHeader and isNewFile:
+                        writer.write(header)
+                    writers[partition] = writer
+                    partitions[partition] = None
+                writer.write(record)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return list(partitions)
+
+
+def HashFile(fileName, end, checkpoint=None):
+    # sha256 первых end байтов файла и, если указан checkpoint, первых checkpoint байтов
+    digest, checkpointDigest = hashlib.sha256(), None
+    limits = [end] if checkpoint is None else [checkpoint, end]
+    with open(fileName, "rb") as file:
+        for i, limit in enumerate(limits):
+            while file.tell() < limit:
+                block = file.read(min(bufferSize, limit - file.tell()))
+                if not block:
+                    break
+                digest.update(block)
+            if i == 0 and checkpoint is not None:
+                checkpointDigest = digest.hexdigest()
+    return checkpointDigest, digest.hexdigest()
+
 
 class Splitter:
-    def __init__(self, fileName, outputPath, outputName):
+    manifestName = "SplitterManifest.json"
+
+    def __init__(self, fileName, outputPath, outputName, outputFormat="csv", workers=1,
+                 granularity="year", maxPartitionBytes=None, indexFileName=None):
+        # outputFormat: "csv" - CSV файл на партицию, "npy" - папка на партицию с колонками NumPy и manifest.json
+        # workers > 1 - файл делится на диапазоны байтов, которые раскладываются по партициям параллельно.
+        # Границы диапазонов берутся из индекса записей CsvRowIndex (indexFileName, по умолчанию
+        # {outputName}.idx в outputPath): перед запуском процессов индекс строится одним последовательным
+        # проходом по всему файлу, при изменении файла - заново
+        # granularity: "year", "quarter" или "month" - период партиции; maxPartitionBytes - наибольший размер
+        # партиции, большие периоды делятся на куски. Мелкие партиции выравнивают нагрузку пула при расчете
+        # Повторный запуск на том же файле ничего не делает, если в файл только дописали строки -
+        # обрабатывается только хвост, при любом другом изменении партиции строятся заново
         self.fileName = fileName
         self.outputPath = outputPath
         self.outputName = outputName
+        self.outputFormat = outputFormat
+        self.workers = workers
+        self.granularity = granularity
+        self.maxPartitionBytes = maxPartitionBytes
+        self.indexFileName = indexFileName or os.path.join(outputPath, f'{outputName}.idx')
         self.SplitFileByYear()
+        self.years = list(dict.fromkeys(GetPartitionYear(partition) for partition in self.partitions))
+        if outputFormat == "npy" and self.changedPartitions:
+            self.ConvertToColumns(self.changedPartitions)
+
+    def GetFileName(self, partition):
+        if self.outputFormat == "npy":
+            return os.path.join(self.outputPath, f'{self.outputName}{partition}')
+        return self.GetCsvFileName(partition)
+
+    def GetCsvFileName(self, partition):
+        return GetPartitionFileName(self.outputPath, self.outputName, ".csv", partition)
+
+    def ConvertToColumns(self, partitions):
+        # Партиции переводятся в колонки по одной, чтобы в памяти была не больше одной партиции.
+        # CSV партиции остаются: в них дописываются новые строки при следующем запуске
+        columnarPartitions = ColumnarPartitions(self.outputPath)
+        for partition in partitions:
+            columnarPartitions.WritePartition(partition, self.GetCsvFileName(partition), self.GetFileName(partition))
+        columnarPartitions.SaveManifest(source=self.fileName)
+
+    def ReadHeader(self):
+        with open(self.fileName, "rb") as file:
+            header = file.readline()
+        start = len(header)
+        if header.startswith(b"\xef\xbb\xbf"):
+            header = header[3:]
+        return header if header.endswith(b"\n") else header + b"\n", start
+
+    def ReadManifest(self):
+        manifestFile = os.path.join(self.outputPath, self.manifestName)
+        if not os.path.exists(manifestFile):
+            return None
+        with open(manifestFile, encoding="utf-8") as file:
+            manifest = json.load(file)
+        parameters = (os.path.abspath(self.fileName), self.outputName, self.outputFormat,
+                      self.granularity, self.maxPartitionBytes)
+        if "partitions" not in manifest or (manifest["source"], manifest["outputName"], manifest["outputFormat"],
+                                            manifest["granularity"], manifest["maxPartitionBytes"]) != parameters:
+            return None
+        return manifest
+
+    def SaveManifest(self, header, sourceHash, size):
+        manifest = {"source": os.path.abspath(self.fileName), "outputName": self.outputName,
+                    "outputFormat": self.outputFormat, "granularity": self.granularity,
+                    "maxPartitionBytes": self.maxPartitionBytes, "header": header.decode("utf-8"), "offset": size,
+                    "sha256": sourceHash, "mtime": os.stat(self.fileName).st_mtime_ns, "partitions": self.partitions}
+        with open(os.path.join(self.outputPath, self.manifestName), "w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+
+    def RemovePartitions(self, manifest):
+        for partition in manifest["partitions"] if manifest else []:
+            for path in (self.GetCsvFileName(partition), self.GetFileName(partition)):
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                elif os.path.exists(path):
+                    os.remove(path)
+        columnarManifest = os.path.join(self.outputPath, ColumnarPartitions.manifestName)
+        if os.path.exists(columnarManifest):
+            os.remove(columnarManifest)
 
     def SplitFileByYear(self):
-        df = pd.read_csv(self.fileName)
-        df["years"] = df["published_at"].apply(lambda date: int(date[0:4]))
-        self.years = df["years"].unique()
-        dfGroupByYear = df.groupby("years")
-        for year, data in dfGroupByYear:
-            data.iloc[:, :6].to_csv(f'{self.outputPath}\\{self.outputName}{year}.csv', index=False)
+        os.makedirs(self.outputPath, exist_ok=True)
+        header, start = self.ReadHeader()
+        end = os.path.getsize(self.fileName)
+        manifest = self.ReadManifest()
+        offset = manifest["offset"] if manifest and manifest["header"] == header.decode("utf-8") else None
+        if offset is not None and offset == end and manifest["mtime"] == os.stat(self.fileName).st_mtime_ns:
+            self.partitions, self.changedPartitions = manifest["partitions"], []
+            return
+        prefixHash, sourceHash = HashFile(self.fileName, end, offset if offset is not None and offset <= end else None)
+        if prefixHash is not None and prefixHash == manifest["sha256"]:
+            # Файл не изменился или в него только дописали строки
+            self.changedPartitions = self.SplitByteRange(header, offset, end, append=True) if offset < end else []
+            self.partitions = list(dict.fromkeys(manifest["partitions"] + self.changedPartitions))
+        else:
+            self.RemovePartitions(manifest)
+            self.changedPartitions = self.SplitByteRange(header, start, end)
+            self.partitions = self.changedPartitions
+        self.SaveManifest(header, sourceHash, end)
+
+    def SplitByteRange(self, header, start, end, append=False):
+        if self.workers <= 1:
+            getFileName = partial(GetPartitionFileName, self.outputPath, self.outputName, ".csv")
+            return SplitRange(self.fileName, start, end, header, getFileName, append=append,
+                              granularity=self.granularity, maxPartitionBytes=self.maxPartitionBytes)
+        return self.SplitFileByYearParallel(header, start, end, append)
+
+    def SplitFileByYearParallel(self, header, start, end, append=False):
+        boundaries = self.GetRecordBoundaries(start, end, self.workers)
+        fragmentNames = [partial(GetPartitionFileName, self.outputPath, self.outputName, f'.part{i}')
+                         for i in range(len(boundaries) - 1)]
+        count = len(fragmentNames)
+        with ProcessPoolExecutor(self.workers) as executor:
+            fragmentPartitions = list(executor.map(SplitRange, [self.fileName] * count, boundaries[:-1],
+                                                   boundaries[1:], [header] * count, fragmentNames, [False] * count,
+                                                   [False] * count, [self.granularity] * count,
+                                                   [self.maxPartitionBytes] * count))
+        # Фрагменты партиции склеиваются в порядке диапазонов, поэтому порядок записей совпадает с исходным файлом.
+        # Куски по размеру содержат начало диапазона в имени, поэтому каждый из них приходит из одного фрагмента
+        partitions = list(dict.fromkeys(partition for partitionsByFragment in fragmentPartitions
+                                        for partition in partitionsByFragment))
+        for partition in partitions:
+            isNewFile = not append or not os.path.exists(self.GetCsvFileName(partition))
+            with open(self.GetCsvFileName(partition), "wb" if isNewFile else "ab") as output:
+                if isNewFile:
+                    output.write(header)
+                for getFragmentName, partitionsByFragment in zip(fragmentNames, fragmentPartitions):
+                    if partition in partitionsByFragment:
+                        fragmentName = getFragmentName(partition)
+                        with open(fragmentName, "rb") as fragment:
+                            shutil.copyfileobj(fragment, output, bufferSize)
+                        os.remove(fragmentName)
+        return partitions
+
+    def GetRecordBoundaries(self, start, end, parts):
+        # Границы диапазонов - начала записей из индекса CsvRowIndex, ближайшие к равным долям байтов,
+        # поэтому запись с переводом строки внутри кавычек никогда не разрезается
+        with CsvRowIndex(self.fileName, self.indexFileName) as index:
+            return index.GetByteBoundaries(start, end, parts)
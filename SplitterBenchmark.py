@@ -0,0 +1,72 @@
+import argparse
+import heapq
+import os
+import random
+import shutil
+import time
+from Splitter import Splitter
+
+
+def GenerateFile(fileName, sizeMb, seed=0):
+    randomizer = random.Random(seed)
+    names = ["Программист Python", "Аналитик", "Менеджер по продажам", '"Инженер, ""ведущий"""', "Водитель"]
+    areas = ["Москва", "Санкт-Петербург", "Казань", "Новосибирск", "Екатеринбург", "Омск", "Тула"]
+    currencies = ["RUR"] * 20 + ["USD", "EUR", "KZT", "UAH", "BYR"]
+    years = list(range(2003, 2023))
+    weights = [1.3 ** i for i in range(len(years))]
+    targetSize = sizeMb * (1 << 20)
+    with open(fileName, "w", encoding="utf-8", newline="") as file:
+        file.write("name,salary_from,salary_to,salary_currency,area_name,published_at\n")
+        while file.tell() < targetSize:
+            lines = []
+            for year in randomizer.choices(years, weights, k=10000):
+                salaryFrom = randomizer.randint(10, 200) * 1000
+                lines.append(f'{randomizer.choice(names)},{salaryFrom}.0,{salaryFrom + 20000}.0,'
+                             f'{randomizer.choice(currencies)},{randomizer.choice(areas)},'
+                             f'{year}-{randomizer.randint(1, 12):02}-{randomizer.randint(1, 28):02}T10:00:00+0300\n')
+            file.write("".join(lines))
+
+
+def GetLoadBalance(sizes, workers):
+    # Пул раздает партиции по порядку освободившимся процессам; возвращает отношение времени
+    # самого загруженного процесса к идеальному (1.0 - нагрузка распределена поровну), время ~ размер партиции
+    loads = [0] * workers
+    for size in sizes:
+        heapq.heapreplace(loads, loads[0] + size)
+    return max(loads) / (sum(sizes) / workers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замер масштабирования параллельного разделения файла по годам")
+    parser.add_argument("--size", type=int, default=5120, help="Размер синтетического файла, МБ")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="Количество процессов")
+    parser.add_argument("--granularity", nargs="+", default=["year", "quarter", "month"],
+                        help="Гранулярность партиций для замера баланса нагрузки")
+    parser.add_argument("--chunk", type=int, default=None, help="Наибольший размер партиции, МБ")
+    parser.add_argument("--file", default="SyntheticVacancies.csv", help="Синтетический файл")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        GenerateFile(args.file, args.size)
+    sizeMb = os.path.getsize(args.file) / (1 << 20)
+    baseTime = None
+    print(f'Файл: {args.file}, {sizeMb:.0f} МБ, ядер: {os.cpu_count()}')
+    for workers in args.workers:
+        shutil.rmtree("SplitterBenchmark", ignore_errors=True)
+        start = time.perf_counter()
+        Splitter(args.file, "SplitterBenchmark", "DataByYear", workers=workers)
+        elapsed = time.perf_counter() - start
+        baseTime = baseTime or elapsed
+        print(f'Процессов: {workers:2}, время: {elapsed:7.2f} с, {sizeMb / elapsed:7.1f} МБ/с, '
+              f'ускорение: {baseTime / elapsed:.2f}')
+    shutil.rmtree("SplitterBenchmark", ignore_errors=True)
+    maxPartitionBytes = args.chunk * (1 << 20) if args.chunk else None
+    for granularity in args.granularity:
+        shutil.rmtree("SplitterBenchmark", ignore_errors=True)
+        splitter = Splitter(args.file, "SplitterBenchmark", "Data", granularity=granularity,
+                            maxPartitionBytes=maxPartitionBytes)
+        sizes = [os.path.getsize(splitter.GetFileName(partition)) for partition in splitter.partitions]
+        balance = ", ".join(f'{workers}: {GetLoadBalance(sizes, workers):.2f}' for workers in args.workers)
+        print(f'Партиции: {granularity}, количество: {len(sizes)}, наибольшая: {max(sizes) / sum(sizes):.1%}, '
+              f'перегрузка пула по процессам: {balance}')
+    shutil.rmtree("SplitterBenchmark", ignore_errors=True)
@@ -324,7 +324,12 @@ class DataSet:
         isReverseSort = inputData.isReverseSort
 
         fileReader, columnNames = self.__CsvReader(inputData.fileName)
-        self.vacanciesObjects = self.__CsvFilter(fileReader, columnNames)
+        # Без сортировки и фильтрации для вывода диапазона достаточно первых вакансий до его конца
+        # (отрицательные границы отсчитываются от конца таблицы, для них нужен весь файл)
+        outputRange = [int(bound) for bound in inputData.outputRange]
+        limit = max(outputRange[1] - 1, outputRange[0]) if len(outputRange) == 2 and min(outputRange) > 1 and \
+            not filterParameter and not sortParameter else None
+        self.vacanciesObjects = self.__CsvFilter(fileReader, columnNames, limit)
 
         inputData.Initialize(self.vacanciesObjects)
         self.vacanciesObjects = self.__SortVacancies(sortParameter, self.vacanciesObjects, isReverseSort)
@@ -389,14 +394,15 @@ class DataSet:
         columnNames = fileReader.fieldnames
         return fileReader, columnNames
 
-    def __CsvFilter(self, fileReader, columnNames):
+    def __CsvFilter(self, fileReader, columnNames, limit=None):
         """
-        Обрабатывает полученные на вход данные, возвращает список всех вакансий,
+        Обрабатывает полученные на вход данные, возвращает список всех вакансий (или первых limit вакансий),
         если нет корректных данных - выводит "Нет данных" и прерывает работу программы
 
         Args:
             fileReader: Все строки из файла в виде словарей
             columnNames: Список заголовков полей
+            limit (int): Количество вакансий, после которого чтение файла прекращается
 
         Returns:
             list[Vacancy]: Список всех вакансий
@@ -411,6 +417,8 @@ class DataSet:
                                                 tempRow.pop("salary_currency"), tempRow.pop("salary_gross"))
                 tempRow['key_skills'] = "\n".join(tempRow['key_skills'].split("; "))
                 vacancies.append(Vacancy(*tempRow.values()))
+                if limit is not None and len(vacancies) >= limit:
+                    break
 
         if len(vacancies) == 0:
             print("Нет данных")
@@ -1,6 +1,27 @@
 from unittest import TestCase
+from unittest.mock import patch
+import os
+import tempfile
+import time
+import pandas as pd
+import requests
 from TableTask import InputConnect, DataSet, Salary
 from PdfTask import Salary as pdfSalary
+from ExcelReport import GetStatisticsByCityRows
+from ReportChart import ChartRenderer
+from ArtifactPipeline import ArtifactPipeline
+from DynamicsCalculator import Calculator
+from Splitter import Splitter
+from ColumnarPartitions import ColumnarPartitions
+from DynamicsExecutor import DynamicsExecutor
+from distributorVacancies import DistributorVacancies
+from MockHHServer import MockHHServer, GenerateVacancies
+from RateLimiter import CircuitBreaker, RequestStatistics
+from ResponseCache import ResponseCache
+from IncrementalHarvester import IncrementalHarvester
+from currenciesParser import ConversionRates
+from CsvRowIndex import CsvRowIndex
+from VacancyLoader import LoadVacancies
 
 class InputConnectTests(TestCase):
     def test_MaxChars(self):
@@ -20,3 +41,388 @@ class SalaryTests(TestCase):
 
     def test_GetAverage(self):
         self.assertEqual(pdfSalary(100, 100, "RUR").GetAverage(), 100.0)
+
+
+class ExcelReportTests(TestCase):
+    def test_GetStatisticsByCityRows(self):
+        self.assertEqual(GetStatisticsByCityRows([{}, {}, {}, {}, {"Москва": 100}, {"Москва": 0.5, "Казань": 0.1}]),
+                         [["Москва", 100, None, "Москва", 0.5], [None, None, None, "Казань", 0.1]])
+
+
+class ChartRendererTests(TestCase):
+    def test_GetPieData(self):
+        # Первые 10 городов - 0,675, остальные два - 0,075
+        citiesRatio = {f'Город {i}': 0.09 - i * 0.005 for i in range(12)}
+        self.assertAlmostEqual(ChartRenderer.GetPieData(citiesRatio)["Другие"], 0.325)
+        self.assertAlmostEqual(ChartRenderer.GetPieData(citiesRatio, othersFromRest=True)["Другие"], 0.075)
+
+
+class ArtifactPipelineTests(TestCase):
+    def test_Dependencies(self):
+        pipeline = ArtifactPipeline()
+        pipeline.AddArtifact("sum", sum, [1, 2])
+        pipeline.AddArtifact("pow", pow, 2, dependsOn=("sum",))
+        self.assertEqual(pipeline.Run(), {"sum": 3, "pow": 8})
+
+    def test_CyclicDependencies(self):
+        pipeline = ArtifactPipeline()
+        pipeline.AddArtifact("a", abs, dependsOn=("b",))
+        pipeline.AddArtifact("b", abs, dependsOn=("a",))
+        self.assertRaises(ValueError, pipeline.Run)
+
+
+class CalculatorTests(TestCase):
+    def test_HandleResultsMergesPartitions(self):
+        result = [("2022-01", (300.0, 2), 2, (0.0, 0), 0, {"Москва": (300.0, 2, 2)}, 2),
+                  ("2022-02", (100.0, 1), 1, (100.0, 1), 1, {"Москва": (100.0, 1, 1), "Омск": (10.0, 1, 1)}, 2),
+                  ("2021Q4", (50.0, 1), 1, (0.0, 0), 0, {"Москва": (50.0, 1, 1)}, 1)]
+        self.assertEqual(Calculator("Аналитик", "Москва").HandleResults(result),
+                         ({2022: 133, 2021: 50}, {2022: 3, 2021: 1}, {2022: 100, 2021: 0}, {2022: 1, 2021: 0},
+                          {"Москва": 112, "Омск": 10}, {"Москва": 0.8, "Омск": 0.2}))
+
+    def test_CitiesCountRowsWithoutArea(self):
+        # Доли и порог 1% - от всех строк, как в расчете по pandas: Омск (0,5%) не проходит порог
+        df = pd.DataFrame({"area_name": ["Москва"] * 98 + ["Омск"] + [None] * 101,
+                           "salary": [100.0, None] * 49 + [50.0] + [10.0] * 101})
+        calculator = Calculator("Аналитик")
+        citiesSums = calculator.GetCitiesSums(df["area_name"], df["salary"].to_numpy())
+        counts = df.groupby("area_name")["area_name"].transform("count")
+        cities = df[counts / len(df) >= 0.01]
+        expected = ({area: int(salary) for area, salary in cities.groupby("area_name")["salary"].mean().items()},
+                    {area: round(count / len(df), 4) for area, count in cities["area_name"].value_counts().items()})
+        self.assertEqual(calculator.GetDynamicsByCity(citiesSums, len(df)), expected)
+        self.assertEqual(expected, ({"Москва": 100}, {"Москва": 0.49}))
+
+    def test_GetVacancyMask(self):
+        names = pd.Series(["Программист C++", "программист", None], dtype="category")
+        self.assertEqual(Calculator("C++").GetVacancyMask(names).tolist(), [True, False, False])
+        self.assertEqual(Calculator("Программист", ignoreCase=True).GetVacancyMask(names).tolist(), [True, True, False])
+
+
+class SplitterTests(TestCase):
+    def test_ParallelEqualsSerial(self):
+        # Внутри кавычек - перевод строки и строка, похожая на запись: границы диапазонов не должны ее разрезать
+        path = tempfile.mkdtemp()
+        fileName = os.path.join(path, "source", "vacancies.csv")
+        os.makedirs(os.path.dirname(fileName))
+        with open(fileName, "w", encoding="utf-8", newline="") as file:
+            file.write("name,salary,area_name,published_at\n")
+            for i in range(3000):
+                name = f'"Аналитик {i}\nфейк,1,Омск,2019-01-01T00:00:00+0300"' if i % 7 == 0 else f'Аналитик {i}'
+                file.write(f'{name},{i},Москва,{2018 + i % 5}-0{1 + i % 9}-01T00:00:00+0300\n')
+        # Фигурные скобки в пути и имени - не шаблон
+        serial = Splitter(fileName, os.path.join(path, "serial{0}"), "Data{partition}", granularity="month")
+        parallel = Splitter(fileName, os.path.join(path, "parallel{}"), "Data{partition}", workers=3,
+                            granularity="month")
+        self.assertEqual(sorted(serial.partitions), sorted(parallel.partitions))
+        for partition in serial.partitions:
+            with open(serial.GetFileName(partition), "rb") as serialFile, \
+                    open(parallel.GetFileName(partition), "rb") as parallelFile:
+                self.assertEqual(serialFile.read(), parallelFile.read())
+        self.assertEqual(os.listdir(os.path.dirname(fileName)), ["vacancies.csv"])
+
+
+    def test_NpyMatchesCsvWithEmptyAreas(self):
+        # Вакансии без города в колонках NumPy - пропуски, как в CSV, а не город ""
+        path = tempfile.mkdtemp()
+        fileName = os.path.join(path, "vacancies.csv")
+        with open(fileName, "w", encoding="utf-8") as file:
+            file.write("name,salary,area_name,published_at\n")
+            for i in range(300):
+                area = "" if i % 3 == 0 else ["Москва", "Омск"][i % 2]
+                file.write(f'Аналитик {i},{1000 + i},{area},{2020 + i % 2}-05-01T00:00:00+0300\n')
+        results = []
+        for outputFormat in ("csv", "npy"):
+            splitter = Splitter(fileName, os.path.join(path, outputFormat), "Data", outputFormat=outputFormat)
+            calculator = Calculator("Аналитик")
+            partitions = [(splitter.GetFileName(partition), partition) for partition in splitter.partitions]
+            results.append(calculator.HandleResults([calculator.GetDynamicsByYear(*args) for args in partitions]))
+        self.assertEqual(results[0], results[1])
+        self.assertNotIn("", results[1][5])
+
+
+    def test_SkipsPartitionsByManifest(self):
+        path = tempfile.mkdtemp()
+        fileName = os.path.join(path, "vacancies.csv")
+        with open(fileName, "w", encoding="utf-8") as file:
+            file.write("name,salary,area_name,published_at\n")
+            for i in range(100):
+                file.write(f'Аналитик,{1000 + i},Москва,{2020 + i % 2}-05-01T00:00:00+0300\n')
+        splitter = Splitter(fileName, os.path.join(path, "npy"), "Data", outputFormat="npy")
+        calculator = Calculator("Аналитик", years=[2021])
+        with patch.object(ColumnarPartitions, "LoadColumns", wraps=ColumnarPartitions.LoadColumns) as loadColumns:
+            partitions = calculator.SelectPartitions(splitter)
+            result = calculator.HandleResults([calculator.GetDynamicsByYear(splitter.GetFileName(partition), partition)
+                                               for partition in partitions])
+        self.assertEqual(partitions, [2021])
+        self.assertEqual([call.args[0] for call in loadColumns.call_args_list], [splitter.GetFileName(2021)])
+        self.assertEqual(result[1], {2021: 50})
+
+
+class DynamicsExecutorTests(TestCase):
+    def test_GetWorkers(self):
+        self.assertEqual(DynamicsExecutor(workers=16).GetWorkers([100, 10, 10]), 2)
+        self.assertEqual(DynamicsExecutor(workers=16).GetWorkers([10] * 20), 16)
+        self.assertEqual(DynamicsExecutor(workers=16, memoryBudget=35).GetWorkers([10] * 20), 3)
+
+    def test_UnknownStrategy(self):
+        self.assertRaises(ValueError, DynamicsExecutor, "gpu")
+
+
+class DistributorVacanciesTests(TestCase):
+    def test_GetVacanciesByWindows(self):
+        day = pd.Timestamp("2022-12-02")
+        mockVacancies = GenerateVacancies(day, 450)
+        with MockHHServer(mockVacancies, latency=0) as server:
+            distributor = DistributorVacancies(concurrency=4, url=server.url)
+            timeRanges = [distributor.GetTimeRange(day + pd.Timedelta(hours=12 * i), 12) for i in range(2)]
+            vacancies = distributor.GetVacanciesByWindows(timeRanges)
+            self.assertEqual(max(server.requests.values()), 1)
+        # Окна по порядку, внутри окна - порядок страниц сервера
+        expected = sorted(mockVacancies, key=lambda vacancy: vacancy["published_at"] >= "2022-12-02T12")
+        self.assertEqual([vacancy["published_at"] for vacancy in vacancies],
+                         [vacancy["published_at"] for vacancy in expected])
+
+    def test_RetriesServerErrors(self):
+        day = pd.Timestamp("2022-12-02")
+        with MockHHServer(GenerateVacancies(day, 300), latency=0, errorRate=0.3) as server:
+            distributor = DistributorVacancies(url=server.url, requestsPerSecond=100, baseDelay=0.01)
+            self.assertEqual(len(distributor.GetVacancies(distributor.GetTimeRange(day, 24))), 300)
+            self.assertEqual(distributor.statistics.errors, distributor.statistics.retries)
+
+    def test_FailsWithoutSleepAfterLastRetry(self):
+        with MockHHServer([], latency=0, errorRate=1) as server:
+            distributor = DistributorVacancies(url=server.url, maxRetries=0)
+            # Задержка перед повтором не вычисляется, значит и не выжидается
+            with patch.object(distributor, "GetRetryDelay") as getRetryDelay:
+                self.assertRaises(requests.exceptions.ConnectionError, distributor.GetResponse, server.url)
+            getRetryDelay.assert_not_called()
+            self.assertEqual(distributor.statistics.errors, 1)
+
+    def test_BisectsWindowsOverResultsCap(self):
+        day = pd.Timestamp("2022-12-02")
+        with MockHHServer(GenerateVacancies(day, 900), latency=0, maxResults=200) as server:
+            distributor = DistributorVacancies(url=server.url, requestsPerSecond=1000)
+            distributor.maxResults = 200
+            vacancies = distributor.GetVacancies(distributor.GetTimeRange(day, 24))
+        self.assertEqual(len({(vacancy["name"], vacancy["published_at"]) for vacancy in vacancies}),
+                         len({(vacancy["name"], vacancy["published_at"]) for vacancy in server.vacancies}))
+        self.assertEqual(len(vacancies), 900)
+
+    def test_SplitSecondReturnedOnce(self):
+        # Первое деление окна суток - в 12:00:00; при включаемом date_to вакансия этой секунды есть в обеих половинах
+        day = pd.Timestamp("2022-12-02")
+        mockVacancies = GenerateVacancies(day, 900)
+        mockVacancies[0]["published_at"] = "2022-12-02T12:00:00+0300"
+        with MockHHServer(mockVacancies, latency=0, maxResults=200, inclusiveDateTo=True) as server:
+            distributor = DistributorVacancies(url=server.url, requestsPerSecond=1000)
+            distributor.maxResults = 200
+            vacancies = distributor.GetVacancies(distributor.GetTimeRange(day, 24))
+        self.assertEqual(sorted(vacancy["id"] for vacancy in vacancies),
+                         sorted(vacancy["id"] for vacancy in mockVacancies))
+
+    def test_ResumesInterruptedHarvest(self):
+        day = pd.Timestamp("2022-12-02")
+        fileName = os.path.join(tempfile.mkdtemp(), "vacancies.csv")
+        with MockHHServer(GenerateVacancies(day, 700), latency=0) as server:
+            distributor = DistributorVacancies(concurrency=1, url=server.url, requestsPerSecond=1000)
+            getPage, calls = distributor.GetPage, []
+            distributor.GetPage = lambda *args: calls.append(args) or (getPage(*args) if len(calls) <= 3 else 1 / 0)
+            self.assertRaises(ZeroDivisionError, distributor.GetVacanciesCSV, day, 1, fileName)
+            DistributorVacancies(url=server.url, requestsPerSecond=1000).GetVacanciesCSV(day, 1, fileName)
+        ids = pd.read_csv(fileName, dtype={"id": str})["id"]
+        self.assertEqual(len(ids), 700)
+        self.assertTrue(ids.is_unique)
+
+    def test_NewHarvestRewritesFile(self):
+        day = pd.Timestamp("2022-12-02")
+        fileName = os.path.join(tempfile.mkdtemp(), "vacancies.csv")
+        nextDay = GenerateVacancies(day + pd.Timedelta(days=1), 200, seed=1)
+        for vacancy in nextDay:
+            vacancy["id"] = str(int(vacancy["id"]) + 1000)
+        with MockHHServer(GenerateVacancies(day, 300) + nextDay, latency=0) as server:
+            for date in (day, day + pd.Timedelta(days=1)):
+                DistributorVacancies(url=server.url, requestsPerSecond=1000).GetVacanciesCSV(date, 1, fileName)
+        ids = pd.read_csv(fileName, dtype={"id": str})["id"]
+        self.assertEqual(sorted(ids), sorted(str(vacancy["id"]) for vacancy in nextDay))
+
+    def test_WritesPagesInOrder(self):
+        # Поздние страницы отвечают быстрее ранних, но в файле порядок окон и страниц
+        day = pd.Timestamp("2022-12-02")
+        fileName = os.path.join(tempfile.mkdtemp(), "vacancies.csv")
+        with MockHHServer(GenerateVacancies(day, 900), latency=0, maxResults=300) as server:
+            distributor = DistributorVacancies(url=server.url, requestsPerSecond=1000)
+            distributor.maxResults = 300
+            expected = [vacancy["id"] for vacancy in distributor.GetVacanciesByWindows(
+                [distributor.GetTimeRange(day + pd.Timedelta(hours=12 * i), 12) for i in range(2)])]
+            getPage = distributor.GetPage
+            distributor.GetPage = lambda timeRange, page=0: time.sleep(0.05 * (3 - page)) or getPage(timeRange, page)
+            distributor.GetVacanciesCSV(day, 2, fileName)
+        self.assertEqual(pd.read_csv(fileName, dtype={"id": str})["id"].tolist(), expected)
+
+    def test_ServesClosedWindowsFromCache(self):
+        day = pd.Timestamp("2022-12-02")
+        with MockHHServer(GenerateVacancies(day, 300), latency=0) as server, \
+                ResponseCache(os.path.join(tempfile.mkdtemp(), "cache.db")) as cache:
+            for _ in range(2):
+                distributor = DistributorVacancies(url=server.url, requestsPerSecond=1000, cache=cache)
+                self.assertEqual(len(distributor.GetVacancies(distributor.GetTimeRange(day, 24))), 300)
+            self.assertEqual(server.GetRequestsCount(), cache.misses)
+            self.assertEqual(cache.hits, cache.misses)
+
+    def test_GetColumnsFromPage(self):
+        distributor = DistributorVacancies()
+        page = {"items": GenerateVacancies(pd.Timestamp("2022-12-02"), 50)}
+        rows = [tuple(vacancy.values()) for vacancy in distributor.GetVacanciesFromPage(page)]
+        self.assertEqual(list(zip(*distributor.GetColumnsFromPage(page))), rows)
+
+
+class IncrementalHarvesterTests(TestCase):
+    def test_HarvestsOnlyNewInterval(self):
+        day = pd.Timestamp("2022-12-02")
+        path = tempfile.mkdtemp()
+        cache = ResponseCache(os.path.join(path, "cache.db"))
+        cache.Set(ConversionRates.GetUrl("2022-12"), None, b"<ValCurs><Valute><CharCode>USD</CharCode>"
+                  b"<Nominal>1</Nominal><Value>62,5</Value></Valute></ValCurs>", neverExpires=True)
+        with MockHHServer(GenerateVacancies(day, 1000), latency=0) as server:
+            distributor = DistributorVacancies(url=server.url, requestsPerSecond=1000)
+            newCounts = []
+            for now in ["2022-12-02T12:00", "2022-12-03T00:00", "2022-12-03T00:00"]:
+                harvester = IncrementalHarvester(distributor, os.path.join(path, "vacancies.csv"),
+                                                 os.path.join(path, "converted.csv"), os.path.join(path, "state.json"),
+                                                 startDate=day, conversionRates=ConversionRates(cache))
+                newCounts.append(harvester.RunOnce(now)[0])
+        self.assertEqual(sum(newCounts), 1000)
+        self.assertEqual(newCounts[-1], 0)
+        converted = pd.read_csv(os.path.join(path, "converted.csv"))
+        self.assertEqual(harvester.state["byMonth"]["2022-12"][1], len(converted))
+        self.assertEqual(harvester.GetSummary()[0]["2022-12"], int(converted["salary"].mean()))
+        cache.Close()
+
+    def test_PollErrorDoesNotStopRun(self):
+        # Первый опрос падает после чтения новых строк; второй читает их заново с сохраненного смещения
+        day = pd.Timestamp("2022-12-02")
+        path = tempfile.mkdtemp()
+        with MockHHServer(GenerateVacancies(day, 1000), latency=0) as server, \
+                ResponseCache(os.path.join(path, "cache.db")) as cache:
+            cache.Set(ConversionRates.GetUrl("2022-12"), None, b"<ValCurs><Valute><CharCode>USD</CharCode>"
+                      b"<Nominal>1</Nominal><Value>62,5</Value></Valute></ValCurs>", neverExpires=True)
+            harvester = IncrementalHarvester(DistributorVacancies(url=server.url, requestsPerSecond=1000),
+                                             os.path.join(path, "vacancies.csv"), os.path.join(path, "converted.csv"),
+                                             os.path.join(path, "state.json"), interval=0, startDate=day,
+                                             conversionRates=ConversionRates(cache))
+            convertVacancies, calls = harvester.ConvertVacancies, []
+            harvester.ConvertVacancies = lambda df: calls.append(len(df)) or (
+                convertVacancies(df) if len(calls) > 1 else 1 / 0)
+            harvester.Run(iterations=2)
+        self.assertEqual(calls, [1000, 1000])
+        converted = pd.read_csv(os.path.join(path, "converted.csv"))
+        self.assertEqual(harvester.state["byMonth"]["2022-12"][1], len(converted))
+
+    def test_RebuildsShortenedConvertedFile(self):
+        # Сконвертированный файл обрезан или удален между опросами: он строится заново без нулей
+        day = pd.Timestamp("2022-12-02")
+        path = tempfile.mkdtemp()
+        convertedFileName = os.path.join(path, "converted.csv")
+        with MockHHServer(GenerateVacancies(day, 1000), latency=0) as server, \
+                ResponseCache(os.path.join(path, "cache.db")) as cache:
+            cache.Set(ConversionRates.GetUrl("2022-12"), None, b"<ValCurs><Valute><CharCode>USD</CharCode>"
+                      b"<Nominal>1</Nominal><Value>62,5</Value></Valute></ValCurs>", neverExpires=True)
+            harvester = IncrementalHarvester(DistributorVacancies(url=server.url, requestsPerSecond=1000),
+                                             os.path.join(path, "vacancies.csv"), convertedFileName,
+                                             os.path.join(path, "state.json"), startDate=day,
+                                             conversionRates=ConversionRates(cache))
+            harvester.RunOnce("2022-12-02T12:00")
+            expected = pd.read_csv(convertedFileName)
+            with open(convertedFileName, "r+b") as file:
+                file.truncate(100)
+            harvester.RunOnce("2022-12-02T12:00")
+            os.remove(convertedFileName)
+            harvester.RunOnce("2022-12-03T00:00")
+        with open(convertedFileName, "rb") as file:
+            self.assertNotIn(b"\0", file.read())
+        converted = pd.read_csv(convertedFileName)
+        self.assertEqual(converted.iloc[:len(expected)]["salary"].tolist(), expected["salary"].tolist())
+        self.assertEqual(harvester.state["byMonth"]["2022-12"][1], len(converted))
+        self.assertAlmostEqual(harvester.state["byMonth"]["2022-12"][0], converted["salary"].sum(), delta=1)
+
+    def test_ConvertsOnlySharedCurrencies(self):
+        path = tempfile.mkdtemp()
+        with ResponseCache(os.path.join(path, "cache.db")) as cache:
+            cache.Set(ConversionRates.GetUrl("2022-12"), None, b"<ValCurs><Valute><CharCode>USD</CharCode><Nominal>1"
+                      b"</Nominal><Value>62,5</Value></Valute><Valute><CharCode>GEL</CharCode><Nominal>1</Nominal>"
+                      b"<Value>23</Value></Valute></ValCurs>", neverExpires=True)
+            harvester = IncrementalHarvester(None, stateFileName=os.path.join(path, "state.json"),
+                                             startDate="2022-12-01", conversionRates=ConversionRates(cache))
+            df = pd.DataFrame({"name": ["a", "b", "c"], "salary_from": [100.0, 100.0, 100.0],
+                               "salary_to": [None, 300.0, None], "salary_currency": ["USD", "GEL", "RUR"],
+                               "area_name": ["Москва"] * 3, "published_at": ["2022-12-02T10:00:00+0300"] * 3})
+            self.assertEqual(harvester.ConvertVacancies(df)["salary"].tolist(), [6250.0, 100.0])
+
+
+class CsvRowIndexTests(TestCase):
+    def test_QuotedNewlines(self):
+        fileName = os.path.join(tempfile.mkdtemp(), "vacancies.csv")
+        with open(fileName, "w", encoding="utf-8-sig", newline="") as file:
+            file.write('name,description\r\n"Аналитик","строка\nфейк,запись"\r\n\r\nБухгалтер,"""кавычки"""\r\n'
+                       'Водитель,\r\n')
+        with CsvRowIndex(fileName) as index:
+            self.assertEqual(index.columns, ["name", "description"])
+            self.assertEqual(len(index), 3)
+            self.assertEqual(index.GetRow(0), ["Аналитик", "строка\nфейк,запись"])
+            self.assertEqual(index.GetRows(1, 10), [["Бухгалтер", '"кавычки"'], ["Водитель", ""]])
+            self.assertEqual(len(index.GetSample(2, seed=0)), 2)
+            self.assertRaises(IndexError, index.GetRow, 3)
+
+
+class VacancyLoaderTests(TestCase):
+    def test_LoadVacancies(self):
+        fileName = os.path.join(tempfile.mkdtemp(), "vacancies.csv")
+        with open(fileName, "w", encoding="utf-8") as file:
+            file.write("name,salary_from,salary_to,salary_currency,area_name,published_at\n"
+                       "Аналитик,100000.0,,RUR,Москва,2022-07-05T18:23:07+0300\n"
+                       "Водитель,,,,Москва,\n")
+        df = LoadVacancies(fileName, ["name", "salary_from", "area_name", "published_at", "salary"], dates="month")
+        self.assertEqual(list(df.columns), ["name", "salary_from", "area_name", "published_at"])
+        self.assertEqual(str(df["salary_from"].dtype), "float32")
+        self.assertEqual(str(df["area_name"].dtype), "category")
+        self.assertEqual(df["published_at"].tolist(), [202207, 0])
+        self.assertEqual(LoadVacancies(fileName, dates="datetime")["published_at"][0],
+                         pd.Timestamp("2022-07-05 18:23:07"))
+        self.assertRaises(ValueError, LoadVacancies, fileName, dates="year")
+
+
+class ResponseCacheTests(TestCase):
+    def test_GetKey(self):
+        self.assertEqual(ResponseCache.GetKey("HTTP://Api.hh.ru/vacancies?page=1", {"per_page": 100}),
+                         ResponseCache.GetKey("http://api.hh.ru/vacancies?per_page=100&page=1"))
+
+    def test_Expires(self):
+        with ResponseCache(os.path.join(tempfile.mkdtemp(), "cache.db"), maxAge=-1) as cache:
+            cache.Set("http://www.cbr.ru/rates", {"date": "01/12/2022"}, b"closed", neverExpires=True)
+            cache.Set("http://www.cbr.ru/rates", {"date": "today"}, b"open")
+            self.assertEqual(cache.Get("http://www.cbr.ru/rates", {"date": "01/12/2022"}), b"closed")
+            self.assertIsNone(cache.Get("http://www.cbr.ru/rates", {"date": "today"}))
+
+
+class CircuitBreakerTests(TestCase):
+    def test_OpensAfterFailures(self):
+        breaker = CircuitBreaker(failureThreshold=2, resetTimeout=0.1)
+        breaker.RecordFailure()
+        self.assertIsNone(breaker.openedAt)
+        breaker.RecordFailure()
+        self.assertIsNotNone(breaker.openedAt)
+        breaker.Acquire()
+        self.assertTrue(breaker.isTrialRunning)
+        breaker.RecordSuccess()
+        self.assertIsNone(breaker.openedAt)
+
+
+class RequestStatisticsTests(TestCase):
+    def test_LatencyWindow(self):
+        statistics = RequestStatistics(latencyWindow=3)
+        for latency in (9, 8, 1, 2, 3):
+            statistics.AddRequest(latency)
+        self.assertEqual(statistics.requests, 5)
+        self.assertEqual(list(statistics.latencies), [1, 2, 3])
+        self.assertEqual(statistics.GetPercentile(99), 3)
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+# Схема файлов вакансий. Границы вилки - целые числа, они точно помещаются в float32 (до 16,7 млн),
+# пересчитанная в рубли зарплата остается float64. Город и валюта повторяются - категории.
+# Колонки, которых нет в схеме (name, published_at), читаются как строки
+dtypes = {"salary_from": "float32", "salary_to": "float32", "salary": "float64", "salary_currency": "category",
+          "area_name": "category"}
+dateFormats = (None, "datetime", "month")
+
+
+def LoadVacancies(fileName, columns=None, dates=None, dtype=None, **parameters):
+    # columns - нужные колонки (тех, что нет в файле, в результате нет), None - все колонки файла.
+    # dates: None - published_at остается строкой, "datetime" - datetime64 местного времени без пояса,
+    # "month" - int32 код ггггмм. dtype дополняет или заменяет типы схемы, остальное передается в read_csv
+    if dates not in dateFormats:
+        raise ValueError(f'Неизвестный формат даты "{dates}"')
+    df = pd.read_csv(fileName, usecols=None if columns is None else lambda column: column in columns,
+                     dtype={**dtypes, **(dtype or {})}, **parameters)
+    if dates is not None and "published_at" in df:
+        df["published_at"] = ConvertDates(df["published_at"], dates)
+    return df
+
+
+def ConvertDates(dates, format):
+    # Разбирается только "гггг-мм-ддTчч:мм:сс", часовой пояс отбрасывается, как в ConvertToRub.
+    # Различных дат в файле на порядки меньше, чем строк, поэтому разбираются только уникальные значения,
+    # а результат раскладывается по кодам factorize без временной колонки срезов строк
+    codes, uniques = pd.factorize(dates)
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object).str[:19], format="%Y-%m-%dT%H:%M:%S")
+    if format == "datetime":
+        return pd.Series(pd.DatetimeIndex(parsed).take(codes, allow_fill=True, fill_value=pd.NaT),
+                         index=dates.index, name=dates.name)
+    # Пропущенная дата - код 0
+    months = np.append((parsed.dt.year * 100 + parsed.dt.month).to_numpy(np.int32), np.int32(0))
+    return pd.Series(months[codes], index=dates.index, name=dates.name)
@@ -0,0 +1,58 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import pandas as pd
+from DynamicsBenchmark import GenerateVacancies, GetPeakRss
+from VacancyLoader import LoadVacancies
+
+# Чтение без схемы (как было во всех вызовах pd.read_csv) и через VacancyLoader с разными форматами даты
+variants = {"read_csv": lambda fileName: pd.read_csv(fileName),
+            "loader": lambda fileName: LoadVacancies(fileName),
+            "loader-datetime": lambda fileName: LoadVacancies(fileName, dates="datetime"),
+            "loader-month": lambda fileName: LoadVacancies(fileName, dates="month"),
+            "calculator": lambda fileName: LoadVacancies(fileName, ["name", "salary", "area_name"],
+                                                         dtype={"name": "category"})}
+
+
+def RunSingle(fileName, variant):
+    # Один замер в отдельном процессе: пиковая память процесса относится только к этому чтению
+    baseRss = GetPeakRss()
+    start = time.perf_counter()
+    df = variants[variant](fileName)
+    parseTime = time.perf_counter() - start
+    return {"parseTime": parseTime, "peakRss": GetPeakRss() - baseRss,
+            "frameMemory": int(df.memory_usage(deep=True).sum()), "columns": len(df.columns)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Время разбора и память VacancyLoader против pd.read_csv")
+    parser.add_argument("--rows", type=int, default=10000000, help="Количество строк синтетического файла")
+    parser.add_argument("--variants", nargs="+", default=list(variants), choices=list(variants))
+    parser.add_argument("--dataPath", default="DynamicsBenchmarkData", help="Папка синтетических файлов")
+    parser.add_argument("--output", help="Файл результатов в JSON")
+    parser.add_argument("--single", nargs=2, metavar=("FILE", "VARIANT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(RunSingle(*args.single)))
+        sys.exit()
+
+    os.makedirs(args.dataPath, exist_ok=True)
+    fileName = os.path.join(args.dataPath, f'Vacancies{args.rows}.csv')
+    if not os.path.exists(fileName):
+        GenerateVacancies(fileName, args.rows)
+    print(f'{fileName}: {os.path.getsize(fileName) / (1 << 20):.0f} МБ')
+    results = {}
+    for variant in args.variants:
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--single", fileName, variant],
+                                capture_output=True, text=True, check=True).stdout
+        result = results[variant] = json.loads(output.splitlines()[-1])
+        print(f'{variant:>16}: {result["parseTime"]:6.1f} с, пик памяти {result["peakRss"] / (1 << 20):6.0f} МБ, '
+              f'DataFrame {result["frameMemory"] / (1 << 20):6.0f} МБ, колонок {result["columns"]}')
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"rows": args.rows, "fileSize": os.path.getsize(fileName), "variants": results}, file,
+                      ensure_ascii=False, indent=2)
@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+import os
+import sqlite3
+
+
+class VacancySink:
+    # Дописывает вакансии в CSV (или JSONL, если имя файла оканчивается на .jsonl) по мере получения страниц.
+    # Рядом с файлом в {fileName}.state.db хранятся id записанных вакансий (повторы из пересекающихся окон
+    # отбрасываются), выполненные пары (окно, страница), план окон и размер файла на момент последней записи.
+    # Страница записывается в файл, затем одной транзакцией фиксируется состояние, поэтому после сбоя
+    # файл обрезается до зафиксированного размера и сбор продолжается с невыполненных страниц
+    columns = ["id", "name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]
+
+    def __init__(self, fileName):
+        self.fileName = fileName
+        self.isJsonLines = fileName.endswith(".jsonl")
+        self.connection = sqlite3.connect(f'{fileName}.state.db')
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS ids (id TEXT PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS units (window TEXT, page INTEGER, PRIMARY KEY (window, page));
+            CREATE TABLE IF NOT EXISTS windows (harvest TEXT, window TEXT, pages INTEGER);
+            CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER);
+        """)
+        row = self.connection.execute("SELECT value FROM state WHERE key = 'offset'").fetchone()
+        if row and not os.path.exists(fileName):
+            # Файл удален - сбор начинается заново
+            with self.connection:
+                for table in ("ids", "units", "windows", "state"):
+                    self.connection.execute(f'DELETE FROM {table}')
+            row = None
+        offset = row[0] if row else 0
+        self.file = open(fileName, "r+b" if row else "wb")
+        # Хвост, записанный после последней зафиксированной страницы, отбрасывается
+        self.file.truncate(offset)
+        self.file.seek(offset)
+        self.completedUnits = set(self.connection.execute("SELECT window, page FROM units"))
+        self.written = 0
+        self.duplicates = 0
+
+    @staticmethod
+    def GetWindowKey(timeRange):
+        return f'{timeRange[0]:%Y-%m-%dT%H:%M:%S}/{timeRange[1]:%Y-%m-%dT%H:%M:%S}'
+
+    @staticmethod
+    def GetHarvestKey(timeRanges):
+        return ",".join(VacancySink.GetWindowKey(timeRange) for timeRange in timeRanges)
+
+    def IsCompleted(self, window, page):
+        return (window, page) in self.completedUnits
+
+    def GetPlan(self, harvest):
+        rows = self.connection.execute("SELECT window, pages FROM windows WHERE harvest = ? ORDER BY rowid",
+                                       (harvest,)).fetchall()
+        return rows or None
+
+    def SavePlan(self, harvest, windows):
+        with self.connection:
+            self.connection.execute("DELETE FROM windows WHERE harvest = ?", (harvest,))
+            self.connection.executemany("INSERT INTO windows VALUES (?, ?, ?)",
+                                        [(harvest, window, pages) for window, pages in windows])
+
+    def Clear(self):
+        # Файл и состояние - с нуля
+        with self.connection:
+            for table in ("ids", "units", "windows", "state"):
+                self.connection.execute(f'DELETE FROM {table}')
+        self.file.seek(0)
+        self.file.truncate(0)
+        self.completedUnits = set()
+
+    def AddPage(self, window, page, columns):
+        # columns - списки значений в порядке self.columns (DistributorVacancies.GetColumnsFromPage)
+        if self.IsCompleted(window, page):
+            return 0
+        ids = [str(vacancyId) for vacancyId in columns[0]]
+        uniqueIds = list(set(ids))
+        known = set()
+        for start in range(0, len(uniqueIds), 500):
+            part = uniqueIds[start:start + 500]
+            known.update(row[0] for row in self.connection.execute(
+                f'SELECT id FROM ids WHERE id IN ({",".join("?" * len(part))})', part))
+        rows = []
+        for vacancyId, row in zip(ids, zip(*columns)):
+            if vacancyId not in known:
+                known.add(vacancyId)
+                rows.append(row)
+        self.WriteRows(rows)
+        with self.connection:
+            self.connection.executemany("INSERT INTO ids VALUES (?)", [(str(row[0]),) for row in rows])
+            self.connection.execute("INSERT INTO units VALUES (?, ?)", (window, page))
+            self.connection.execute("INSERT OR REPLACE INTO state VALUES ('offset', ?)", (self.file.tell(),))
+        self.completedUnits.add((window, page))
+        self.written += len(rows)
+        self.duplicates += len(ids) - len(rows)
+        return len(rows)
+
+    def WriteRows(self, rows):
+        if self.isJsonLines:
+            lines = "".join(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + "\n" for row in rows)
+        else:
+            lines = self.FormatCsv(rows, self.file.tell() == 0)
+        self.file.write(lines.encode("utf-8"))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def FormatCsv(self, rows, writeHeader):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if writeHeader:
+            writer.writerow(self.columns)
+        writer.writerows(rows)
+        return buffer.getvalue()
+
+    def Close(self):
+        self.file.close()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.Close()
@@ -0,0 +1,8 @@
+from distributorVacancies import DistributorVacancies
+from IncrementalHarvester import IncrementalHarvester
+from ResponseCache import ResponseCache
+from currenciesParser import ConversionRates
+# Кэш - только для курсов ЦБ: у каждого опроса HH свой открытый date_to, его страницы повторно не запрашиваются
+h = IncrementalHarvester(DistributorVacancies(), conversionRates=ConversionRates(ResponseCache()))
+
+h.Run()
@@ -1,6 +1,9 @@
 import pandas as pd
 from distributorVacancies import DistributorVacancies
-d = DistributorVacancies()
+from ResponseCache import ResponseCache
+d = DistributorVacancies(cache=ResponseCache())
 BDayCurrentMonth = pd.Timestamp.now().replace(day = 1) + pd.offsets.BDay()
 
+# Сбор за другой день переписывает DistributorVacancies.csv; повторный запуск за тот же день
+# дозапрашивает только невыполненные страницы прерванного сбора
 d.GetVacanciesCSV(BDayCurrentMonth, 4)
@@ -2,18 +2,54 @@ import pandas as pd
 import requests
 from xml.etree import ElementTree as ET
 from dataBase import DataBase as DB
+from ResponseCache import ResponseCache
+from VacancyLoader import LoadVacancies
+
+# Валюты, зарплаты в которых пересчитываются в рубли (колонки ConversionTable).
+# Общий список для CurrenciesParser и IncrementalHarvester
+convertedCurrencies = ["RUR", "USD", "EUR", "KZT", "UAH", "BYR"]
+
+
+class ConversionRates:
+    # Курсы ЦБ на первое число месяца (date - "гггг-мм"). Курсы за прошедшие даты не меняются
+    # и при повторных запусках берутся с диска
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else ResponseCache()
+        self.rates = {}
+
+    @staticmethod
+    def GetUrl(date):
+        y, m = date[0:4], date[5:7]
+        return f'http://www.cbr.ru/scripts/XML_daily.asp?date_req=01/{m}/{y}d1'
+
+    def GetMonthRates(self, date):
+        if date not in self.rates:
+            url = self.GetUrl(date)
+            isClosed = pd.Timestamp(f'{date[0:7]}-01') <= pd.Timestamp.now().normalize()
+            tree = ET.fromstring(self.cache.Fetch(url, None, lambda: self.GetRates(url), isClosed))
+            self.rates[date] = {curr.find("CharCode").text: float(curr.find('Value').text.replace(',', '.')) / float(
+                curr.find('Nominal').text) for curr in tree.iter("Valute")}
+        return self.rates[date]
+
+    def GetRates(self, url):
+        response = requests.get(url)
+        response.raise_for_status()
+        return response.content
 
 
 class CurrenciesParser:
 
-    def __init__(self, fileName):
+    def __init__(self, fileName, cache=None):
         self.fileName = fileName
-        df = pd.read_csv(self.fileName)
+        self.conversionRates = ConversionRates(cache)
+        # Только колонки вакансии, валюта и город - категории, границы вилки - float32
+        df = LoadVacancies(self.fileName, ["name", "salary_from", "salary_to", "salary_currency", "area_name",
+                                           "published_at"])
         self.df = self.ApplyPreselection(df)
         self.conversionTable = self.CreateConversionTable(self.df)
         self.dbController = DB("ConversionTable")
-        self.dbController.CreateDataBase(self.conversionTable,
-                                         "date text, USD float, EUR float, KZT float, UAH float, BYR float", True)
+        self.dbController.CreateDataBase(self.conversionTable, ", ".join(
+            ["date text"] + [f'{currency} float' for currency in convertedCurrencies if currency != "RUR"]), True)
         self.dbCursor = self.dbController.OpenDB()
 
     def GetCurrenciesRatio(self, df):
@@ -27,8 +63,8 @@ class CurrenciesParser:
         firstPublication = df['published_at'].min()
         lastPublication = df['published_at'].max()
         dateRange = [f'{str(date)[0:7]}' for date in
-                     pd.date_range(firstPublication, pd.Timestamp(lastPublication) + pd.offsets.MonthEnd(0), freq="M",
-                                   normalize=True)]
+                     pd.date_range(firstPublication, pd.Timestamp(lastPublication) + pd.offsets.MonthEnd(0),
+                                   freq=pd.offsets.MonthEnd(), normalize=True)]
         return dateRange
 
     def CreateConversionTable(self, df):
@@ -37,21 +73,17 @@ class CurrenciesParser:
         currencyDf = pd.DataFrame(index=dateRange, columns=currenciesNames)
         currencyDf.index.names = ["date"]
         for date in dateRange:
-            y, m = date[0:4], date[5:7]
-            response = requests.get(f'http://www.cbr.ru/scripts/XML_daily.asp?date_req=01/{m}/{y}d1')
-            tree = ET.fromstring(response.content)
-            for curr in tree.iter("Valute"):
-                currName = curr.find("CharCode").text
-                if currName in currenciesNames:
-                    currencyDf.at[date, currName] = float(curr.find('Value').text.replace(',', '.')) / float(
-                        curr.find('Nominal').text)
+            rates = self.conversionRates.GetMonthRates(date)
+            for currName in currenciesNames:
+                if currName in rates:
+                    currencyDf.at[date, currName] = rates[currName]
 
         currencyDf.to_csv("ConversionTable.csv")
         return currencyDf
 
     def ApplyPreselection(self, df):
         df = self.GetCurrenciesRatio(df)
-        df = df[df['CurrenciesRatio'] > 5000]
+        df = df[(df['CurrenciesRatio'] > 5000) & df['salary_currency'].isin(convertedCurrencies)]
         df.drop(columns="CurrenciesRatio")
         return df
 
@@ -84,7 +116,8 @@ class CurrenciesParser:
 
         df = self.df.copy()
         df["published_at"] = df["published_at"].transform(lambda x: x[:19])
-        df["salary"] = df[["salary_from", "salary_to"]].mean(axis=1)
+        # Пересчитанная зарплата - float64, как до чтения вилки в float32
+        df["salary"] = df[["salary_from", "salary_to"]].astype("float64").mean(axis=1)
         df["salary"] = df.apply(lambda x: self.ConvertSalary(x), axis=1)
         df = df[df["salary"].notnull()]
         vacanciesDF = df.loc[:, ["name", "salary", "area_name", "published_at"]]
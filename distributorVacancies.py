@@ -1,37 +1,156 @@
+import json
+import random
+import time
 import requests
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from RateLimiter import TokenBucket, CircuitBreaker, RequestStatistics
+from VacancySink import VacancySink
+
+try:
+    # orjson разбирает страницу HH в несколько раз быстрее стандартного json
+    from orjson import loads as LoadJson
+except ImportError:
+    LoadJson = json.loads
 
 class DistributorVacancies:
+    # HH отдает не больше 2000 первых результатов запроса (20 страниц по 100)
+    maxResults = 2000
+    # HH индексирует новые вакансии с задержкой, поэтому окно считается закрытым через час после его конца
+    closedDelay = pd.Timedelta(hours=1)
+    # Даты запроса без пояса HH понимает как московские, published_at приходит в том же поясе
+    timeZone = "Europe/Moscow"
+
+    def __init__(self, concurrency=8, url="https://api.hh.ru/vacancies", requestsPerSecond=10, maxRetries=10,
+                 baseDelay=0.5, maxDelay=60, timeout=30, cache=None):
+        # Одна сессия с keep-alive соединениями на все потоки, одновременно не больше concurrency запросов.
+        # Все потоки делят лимит requestsPerSecond и размыкатель цепи: после серии ошибок запросы не отправляются
+        self.url = url
+        self.concurrency = concurrency
+        self.maxRetries = maxRetries
+        self.baseDelay = baseDelay
+        self.maxDelay = maxDelay
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Без запаса на всплеск: запросы идут равномерно и не превышают лимит сервера в скользящем окне
+        self.tokenBucket = TokenBucket(requestsPerSecond, capacity=1)
+        self.circuitBreaker = CircuitBreaker()
+        self.statistics = RequestStatistics()
+        # ResponseCache: страницы закрытых окон берутся с диска при повторных сборах
+        self.cache = cache
 
-    def GetResponse(self, url):
-        for i in range(1000):
-            response = requests.get(url)
-            if response.ok:
-                print("OK")
+    def GetResponse(self, url, params=None):
+        for attempt in range(self.maxRetries + 1):
+            self.circuitBreaker.Acquire()
+            self.tokenBucket.Acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                response = None
+            isThrottled = response is not None and response.status_code == 429
+            isError = response is None or response.status_code >= 500
+            self.statistics.AddRequest(time.perf_counter() - start, attempt > 0, isThrottled, isError)
+            if isError:
+                self.circuitBreaker.RecordFailure()
+            else:
+                # Сервер ответил (в том числе 429 и 4xx) - цепь замыкается
+                self.circuitBreaker.RecordSuccess()
+            if response is not None and response.ok:
                 return response
+            if not isThrottled and not isError:
+                # Ошибки запроса (400, 403, 404) повтором не исправить
+                response.raise_for_status()
+            if attempt == self.maxRetries:
+                # Последняя попытка: ждать и приостанавливать общий лимит незачем
+                break
+            delay = self.GetRetryDelay(response, attempt)
+            if isThrottled:
+                self.tokenBucket.Pause(delay)
+            time.sleep(delay)
         raise requests.exceptions.ConnectionError("Сервер не отвечает")
 
-    def GetVacancies(self, timeRange):
+    def GetRetryDelay(self, response, attempt):
+        # Retry-After сервера, иначе экспоненциальная задержка со случайным разбросом (full jitter)
+        retryAfter = response.headers.get("Retry-After") if response is not None else None
+        if retryAfter is not None and retryAfter.isdigit():
+            return int(retryAfter)
+        return random.uniform(0, min(self.maxDelay, self.baseDelay * 2 ** attempt))
+
+    def GetParameters(self, timeRange, page=0):
         firstDate, endDate = timeRange
-        firstDate, endDate = firstDate.strftime("%Y-%m-%dT%X"), endDate.strftime("%Y-%m-%dT%X")
-        generalURL = f'https://api.hh.ru/vacancies?date_from={firstDate}&date_to={endDate}&specialization=1&per_page=100'
-        generalResponse = self.GetResponse(generalURL)
-        jsonFile = generalResponse.json()
-        pages = jsonFile['pages']
-        vacancies = []
-        for page in range(pages):
-                pageURL = f'https://api.hh.ru/vacancies?date_from={firstDate}&date_to={endDate}&specialization=1&per_page=100&page={page}'
-                vacancies+=self.GetVacanciesByPage(pageURL)
-        print(len(vacancies))
+        return {"date_from": firstDate.strftime("%Y-%m-%dT%X"), "date_to": endDate.strftime("%Y-%m-%dT%X"),
+                "specialization": 1, "per_page": 100, "page": page}
+
+    def GetPage(self, timeRange, page=0):
+        params = self.GetParameters(timeRange, page)
+        if self.cache is None:
+            return LoadJson(self.GetResponse(self.url, params).content)
+        isClosed = timeRange[1] + self.closedDelay <= self.GetNow()
+        return LoadJson(self.cache.Fetch(self.url, params, lambda: self.GetResponse(self.url, params).content,
+                                           isClosed))
+
+    def GetVacancies(self, timeRange):
+        return self.GetVacanciesByWindows([timeRange])
+
+    def GetVacanciesByWindows(self, timeRanges):
+        # Окна уточняются PlanWindows, затем параллельно запрашиваются остальные страницы всех окон.
+        # Первая страница повторно не запрашивается.
+        # Вакансии идут по порядку окон, внутри окна - по порядку страниц.
+        # Соседние половины поделенного окна делят секунду середины, поэтому повторы отбрасываются по id
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            windows = self.PlanWindows(timeRanges, executor)
+            otherRanges, otherNumbers = [], []
+            for timeRange, firstPage in windows:
+                otherRanges += [timeRange] * (firstPage['pages'] - 1)
+                otherNumbers += range(1, firstPage['pages'])
+            otherPages = iter(list(executor.map(self.GetPage, otherRanges, otherNumbers)))
+        vacancies, ids = [], set()
+        for timeRange, firstPage in windows:
+            pages = [firstPage] + [next(otherPages) for page in range(1, firstPage['pages'])]
+            for page in pages:
+                for vacancy in self.GetVacanciesFromPage(page):
+                    if vacancy['id'] not in ids:
+                        ids.add(vacancy['id'])
+                        vacancies.append(vacancy)
         return vacancies
 
+    def PlanWindows(self, timeRanges, executor):
+        # Первые страницы окон запрашиваются параллельно; окно, в котором найдено больше maxResults вакансий,
+        # делится пополам, пока не поместится в выдачу. Для каждого итогового окна возвращается его первая
+        # страница, поэтому запросов на планирование - по одному на каждое поделенное окно
+        plan = [((timeRange[0], timeRange[1]), None) for timeRange in timeRanges]
+        while any(firstPage is None for _, firstPage in plan):
+            pages = iter(list(executor.map(self.GetPage, [timeRange for timeRange, firstPage in plan
+                                                          if firstPage is None])))
+            newPlan = []
+            for (firstDate, endDate), firstPage in plan:
+                if firstPage is None:
+                    firstPage = next(pages)
+                    middle = firstDate + ((endDate - firstDate) / 2).floor("s")
+                    if firstPage['found'] > self.maxResults:
+                        if firstDate < middle:
+                            newPlan += [((firstDate, middle), None), ((middle, endDate), None)]
+                            continue
+                        print(f'В окне {firstDate} - {endDate} {firstPage["found"]} вакансий, '
+                              f'доступны первые {self.maxResults}')
+                newPlan.append(((firstDate, endDate), firstPage))
+            plan = newPlan
+        return plan
+
     def GetVacanciesByPage(self, url):
+        return self.GetVacanciesFromPage(LoadJson(self.GetResponse(url).content))
+
+    def GetVacanciesFromPage(self, pageJson):
         vacanciesByPage = []
-        pageResponse = self.GetResponse(url)
-        pageJson = pageResponse.json()
         for vacancy in pageJson['items']:
             salaryExist = vacancy['salary']
-            tempVacancy = {'name': vacancy['name'],
+            tempVacancy = {'id': vacancy['id'],
+                           'name': vacancy['name'],
                            'salary_from': vacancy['salary']['from'] if salaryExist else None,
                            'salary_to': vacancy['salary']['to'] if salaryExist else None,
                            'salary_currency': vacancy['salary']['currency'] if salaryExist else None,
@@ -40,16 +159,78 @@ class DistributorVacancies:
             vacanciesByPage.append(tempVacancy)
         return vacanciesByPage
 
-    def GetVacanciesCSV(self, date, deltaTimeRange):
-        df = pd.DataFrame()
+    def GetColumnsFromPage(self, pageJson):
+        # Нужные поля вакансий страницы сразу раскладываются по заранее выделенным спискам колонок
+        # в порядке VacancySink.columns, без словаря на каждую вакансию
+        items = pageJson['items']
+        ids, names, salariesFrom, salariesTo, currencies, areas, dates = [[None] * len(items) for _ in range(7)]
+        for i, vacancy in enumerate(items):
+            ids[i] = vacancy['id']
+            names[i] = vacancy['name']
+            salary = vacancy['salary']
+            if salary:
+                salariesFrom[i], salariesTo[i], currencies[i] = salary['from'], salary['to'], salary['currency']
+            areas[i] = vacancy['area']['name']
+            dates[i] = vacancy['published_at']
+        return ids, names, salariesFrom, salariesTo, currencies, areas, dates
+
+    def GetVacanciesCSV(self, date, deltaTimeRange, fileName="DistributorVacancies.csv"):
+        # Вакансии дописываются в файл по мере получения страниц; прерванный сбор того же дня в тот же файл
+        # продолжается с невыполненных страниц, любой другой сбор переписывает файл заново.
+        # Первая колонка файла - id вакансии HH
         date = date.normalize()
         multiplyHour = int(24 / deltaTimeRange)
+        timeRanges = []
         for i in range(deltaTimeRange):
             timeRange = self.GetTimeRange(date, multiplyHour)
             date = timeRange[1]
-            df = pd.concat([df, pd.DataFrame(self.GetVacancies(timeRange))])
+            timeRanges.append(timeRange)
+        with VacancySink(fileName) as sink:
+            if sink.GetPlan(sink.GetHarvestKey(timeRanges)) is None:
+                sink.Clear()
+            self.HarvestToSink(timeRanges, sink)
+            print(f'Записано вакансий: {sink.written}, повторов отброшено: {sink.duplicates}')
+
+    def HarvestToSink(self, timeRanges, sink):
+        # Страницы запрашиваются параллельно, но записываются по порядку окон и страниц, как в GetVacanciesByWindows:
+        # готовая раньше предыдущих страница ждет своей очереди. Запись идет только из этого потока
+        harvest = sink.GetHarvestKey(timeRanges)
+        executor = ThreadPoolExecutor(self.concurrency)
+        try:
+            ready = {}
+            windows = sink.GetPlan(harvest)
+            if windows is None:
+                plan = self.PlanWindows(timeRanges, executor)
+                ready = {(sink.GetWindowKey(timeRange), 0): self.GetColumnsFromPage(firstPage)
+                         for timeRange, firstPage in plan}
+                windows = [(sink.GetWindowKey(timeRange), firstPage['pages']) for timeRange, firstPage in plan]
+                sink.SavePlan(harvest, windows)
+            units = [(window, page) for window, pages in windows for page in range(pages)
+                     if not sink.IsCompleted(window, page)]
+            futures = {}
+            for window, page in units:
+                if (window, page) not in ready:
+                    timeRange = [pd.Timestamp(date) for date in window.split("/")]
+                    futures[executor.submit(self.GetPage, timeRange, page)] = (window, page)
+            position = self.WriteReadyPages(sink, units, 0, ready)
+            for future in as_completed(futures):
+                ready[futures[future]] = self.GetColumnsFromPage(future.result())
+                position = self.WriteReadyPages(sink, units, position, ready)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def WriteReadyPages(self, sink, units, position, ready):
+        # Записывает подряд готовые страницы начиная с units[position], возвращает первую неготовую
+        while position < len(units) and units[position] in ready:
+            window, page = units[position]
+            sink.AddPage(window, page, ready.pop((window, page)))
+            position += 1
+        return position
 
-        df.to_csv("DistributorVacancies.csv", index=False)
+    @classmethod
+    def GetNow(cls):
+        # Текущее время в поясе HH без указания пояса, как даты окон
+        return pd.Timestamp.now(tz=cls.timeZone).tz_localize(None)
 
     def GetTimeRange(self, date, multiplyHour):
-        return pd.date_range(date, periods=2, freq=f'{multiplyHour}H')
\ No newline at end of file
+        return pd.date_range(date, periods=2, freq=pd.Timedelta(hours=multiplyHour))